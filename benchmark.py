@@ -0,0 +1,552 @@
+"""
+smus MCP 툴 부하 테스트 벤치마크.
+
+로컬 SQLite 파일로 MySQL 연결 인터페이스(pymysql.connect)를 흉내 내는 가짜 DB를 만들고,
+smu_meals / smu_notices / smu_exam / smu_schedule 에 실제와 비슷한 양의 데이터를 채운 뒤
+lastdance1008.py의 `create_app()`(CORS + lifespan 워밍업 포함)을 uvicorn으로 띄우고, /ready가 될 때까지 기다린 뒤
+MCP 클라이언트로 모든 툴을 호출한다.
+툴별 p50/p95/p99 지연, 처리량, DB 쿼리 수를 JSON으로 저장해 실행 간 비교할 수 있다.
+
+사용 예:
+    python benchmark.py --concurrency 16 --requests 400 --output bench_output.json
+    python benchmark.py --latency-ms 5 --connect-ms 40 --env CACHE_MAXSIZE=0
+    python benchmark.py --compare bench_before.json --output bench_after.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import pymysql
+import pymysql.cursors
+from pymysql.constants import FIELD_TYPE
+
+
+# ---- 가짜 DB (SQLite 기반, pymysql 연결 인터페이스 호환) ----
+class FakeDB:
+    """SQLite 파일 DB + 쿼리 카운터 + 인위적 네트워크 지연 설정"""
+
+    def __init__(self, path: str, latency_ms: float = 0.0, connect_ms: float = 0.0):
+        self.path = path
+        self.latency = latency_ms / 1000
+        self.connect_latency = connect_ms / 1000
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.connects = 0
+
+    def count_query(self) -> None:
+        with self._lock:
+            self.queries += 1
+
+    def count_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def connect(self, **kwargs) -> "FakeConnection":
+        if self.connect_latency:
+            time.sleep(self.connect_latency)
+        self.count_connect()
+        return FakeConnection(self, kwargs.get("cursorclass") or pymysql.cursors.Cursor,
+                              kwargs.get("autocommit", False))
+
+
+def _parse_datetime(raw: bytes):
+    s = raw.decode()
+    return datetime.fromisoformat(s) if " " in s or "T" in s else date.fromisoformat(s)
+
+
+sqlite3.register_converter("DATETIME", _parse_datetime)
+
+
+def _translate_sql(sql: str) -> str:
+    """MySQL 방언 → SQLite (툴이 쓰는 범위만)"""
+    sql = sql.replace("%s", "?").replace("%%", "%")
+    sql = re.sub(r"\bFOR UPDATE\b", "", sql)
+    if "UNION ALL" in sql or sql.lstrip().startswith("("):
+        # SQLite는 괄호로 감싼 (복합) SELECT 멤버를 허용하지 않으므로 서브쿼리로 바꾼다
+        sql = re.sub(r"\(\s*(SELECT\b.*?LIMIT \?)\s*\)", r"SELECT * FROM (\1)", sql, flags=re.S)
+    return sql
+
+
+def _type_code(value):
+    """pymysql cursor.description의 type_code 흉내 (첫 행 값 기준)"""
+    if isinstance(value, datetime):
+        return FIELD_TYPE.DATETIME
+    if isinstance(value, date):
+        return FIELD_TYPE.DATE
+    if isinstance(value, str):
+        return FIELD_TYPE.VAR_STRING
+    if isinstance(value, int):
+        return FIELD_TYPE.LONGLONG
+    return None
+
+
+class FakeCursor:
+    def __init__(self, conn: "FakeConnection", cursorclass):
+        self._conn = conn
+        self._dict = issubclass(cursorclass, pymysql.cursors.DictCursor)
+        self._rows: list = []
+        self.description = None
+        self.lastrowid = None
+        self.rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._rows = []
+
+    def execute(self, sql: str, params=None) -> int:
+        db = self._conn.db
+        db.count_query()
+        if db.latency:
+            time.sleep(db.latency)
+        cur = self._conn.raw.execute(_translate_sql(sql), tuple(params or ()))
+        self.rowcount = cur.rowcount
+        if cur.description:
+            names = [d[0] for d in cur.description]
+            rows = cur.fetchall()
+            first = rows[0] if rows else [None] * len(names)
+            self.description = tuple(
+                (name, _type_code(value), None, None, None, None, True) for name, value in zip(names, first)
+            )
+            self._rows = [dict(zip(names, r)) for r in rows] if self._dict else [tuple(r) for r in rows]
+            self.rowcount = len(rows)
+        else:
+            self._rows = []
+            self.description = None
+            # pymysql과 같이 여러 행 INSERT의 lastrowid는 첫 행의 id
+            if cur.lastrowid and cur.rowcount > 0:
+                self.lastrowid = cur.lastrowid - cur.rowcount + 1
+        return self.rowcount
+
+    def executemany(self, sql: str, seq) -> int:
+        total = 0
+        for params in seq:
+            total += self.execute(sql, params)
+        return total
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+
+class FakeConnection:
+    def __init__(self, db: FakeDB, cursorclass, autocommit: bool):
+        self.db = db
+        self._cursorclass = cursorclass
+        self.raw = sqlite3.connect(db.path, timeout=30, isolation_level=None,
+                                   check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+        self.raw.execute("PRAGMA journal_mode=WAL")
+        self._autocommit = autocommit
+
+    @property
+    def server_status(self) -> int:
+        return 1 if self.raw.in_transaction else 0  # SERVER_STATUS_IN_TRANS
+
+    def cursor(self, cursorclass=None) -> FakeCursor:
+        return FakeCursor(self, cursorclass or self._cursorclass)
+
+    def begin(self) -> None:
+        self.raw.execute("BEGIN IMMEDIATE")
+
+    def commit(self) -> None:
+        if self.raw.in_transaction:
+            self.raw.execute("COMMIT")
+
+    def rollback(self) -> None:
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK")
+
+    def ping(self, reconnect: bool = False) -> None:
+        self.raw.execute("SELECT 1")
+
+    def autocommit(self, value: bool) -> None:
+        self._autocommit = value
+
+    def get_autocommit(self) -> bool:
+        return self._autocommit
+
+    def close(self) -> None:
+        self.raw.close()
+
+
+# ---- 시드 데이터 ----
+SCHEMA = """
+CREATE TABLE smu_meals (id INTEGER PRIMARY KEY, `date` DATETIME, category TEXT, meal TEXT);
+CREATE INDEX ix_meals_category_date ON smu_meals (category, `date`);
+CREATE TABLE smu_notices (id INTEGER PRIMARY KEY, title TEXT, url TEXT, created_at DATETIME);
+CREATE TABLE smu_exam (id INTEGER PRIMARY KEY, subject_name TEXT, professor TEXT, exam_date DATETIME, room TEXT);
+CREATE INDEX ix_exam_subject ON smu_exam (subject_name);
+CREATE TABLE smu_schedule (
+    id INTEGER PRIMARY KEY, start_date DATETIME, end_date DATETIME, content TEXT,
+    type TEXT, user_id TEXT, created_at DATETIME
+);
+CREATE INDEX ix_schedule_type_user_start ON smu_schedule (type, user_id, start_date);
+CREATE INDEX ix_schedule_user_type ON smu_schedule (user_id, type);
+"""
+
+DISHES = ["김치찌개", "된장찌개", "제육볶음", "돈까스", "비빔밥", "떡볶이", "카레라이스", "잔치국수",
+          "불고기", "닭갈비", "순두부찌개", "미역국", "샐러드", "치킨마요", "짜장면", "점심 특선"]
+NOTICE_WORDS = ["수강신청", "장학금", "등록금", "휴학", "졸업", "기숙사", "학사일정", "공모전",
+                "채용", "특강", "도서관", "시험", "성적", "계절학기", "봉사활동", "점심 메뉴"]
+SUBJECTS = ["자료구조", "알고리즘", "운영체제", "데이터베이스", "컴퓨터 네트워크", "인공지능", "선형대수",
+            "미적분학", "경영학원론", "회계원리", "심리학개론", "영어회화", "대학글쓰기", "통계학"]
+PROFESSORS = ["김민수", "이서연", "박지훈", "최유진", "정하늘", "강도윤", "조서준", "윤지아"]
+EVENTS = ["중간고사", "기말고사", "개강", "종강", "축제", "수강정정", "휴강", "보강", "MT", "설명회",
+          "스터디", "과제 마감", "팀플 회의", "동아리 모임"]
+
+
+def seed(db_path: str, scale: float, users: int, rng: random.Random) -> dict:
+    raw = sqlite3.connect(db_path)
+    raw.executescript(SCHEMA)
+    base = date.today() - timedelta(days=180)
+    fmt = "%Y-%m-%d %H:%M:%S"
+
+    meals = []
+    for d in range(int(365 * scale) or 1):
+        day = (base + timedelta(days=d)).isoformat()
+        for cat in ("breakfast", "lunch", "dinner"):
+            meals.append((day, cat, ", ".join(rng.sample(DISHES, 4))))
+    raw.executemany("INSERT INTO smu_meals (`date`, category, meal) VALUES (?, ?, ?)", meals)
+
+    notices = [
+        (f"[{rng.choice(NOTICE_WORDS)}] {rng.choice(NOTICE_WORDS)} 안내 {i}", f"https://www.smu.ac.kr/notice/{i}",
+         (datetime.now() - timedelta(minutes=i * 37)).strftime(fmt))
+        for i in range(int(5000 * scale) or 1)
+    ]
+    raw.executemany("INSERT INTO smu_notices (title, url, created_at) VALUES (?, ?, ?)", notices)
+
+    exams = [
+        (f"{rng.choice(SUBJECTS)} {i % 7 + 1}분반", rng.choice(PROFESSORS),
+         (base + timedelta(days=rng.randrange(365))).strftime(fmt), f"G{rng.randrange(100, 600)}")
+        for i in range(int(2000 * scale) or 1)
+    ]
+    raw.executemany("INSERT INTO smu_exam (subject_name, professor, exam_date, room) VALUES (?, ?, ?, ?)", exams)
+
+    schedules = []
+    for i in range(int(20000 * scale) or 1):
+        start = datetime.combine(base, datetime.min.time()) + timedelta(days=rng.randrange(365), hours=rng.randrange(9, 20))
+        end = start + timedelta(days=rng.choice([0, 0, 0, 1, 3]), hours=rng.randrange(0, 3))
+        common = i % 10 == 0
+        schedules.append((start.strftime(fmt), end.strftime(fmt), f"{rng.choice(EVENTS)} {i}",
+                          "common" if common else "personal", None if common else str(20250000 + i % users),
+                          start.strftime(fmt)))
+    raw.executemany(
+        "INSERT INTO smu_schedule (start_date, end_date, content, type, user_id, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        schedules,
+    )
+    raw.commit()
+    counts = {t: raw.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+              for t in ("smu_meals", "smu_notices", "smu_exam", "smu_schedule")}
+    raw.close()
+    return counts
+
+
+# ---- 툴별 호출 시나리오 ----
+def build_scenarios(rng: random.Random, users: int) -> dict:
+    """툴 이름 → 인자 생성 함수. 쓰기 툴은 읽기 툴 뒤에 실행되도록 순서를 유지한다."""
+    today = date.today()
+
+    def day(offset_range=30):
+        return (today + timedelta(days=rng.randrange(-offset_range, offset_range))).isoformat()
+
+    def user():
+        return str(20250000 + rng.randrange(users))
+
+    return {
+        "now_kr": lambda: {},
+        "query_smu_meals_by_date_category": lambda: {"date_iso": day(), "category": rng.choice(["breakfast", "lunch", "dinner"])},
+        "query_smu_meals_by_date_range": lambda: {"start_date": day(), "end_date": None, "categories": None}
+        | ({"end_date": (today + timedelta(days=6)).isoformat(), "start_date": today.isoformat()} if rng.random() < 0.5 else {}),
+        "query_smu_meals_by_keyword": lambda: {"keyword": rng.choice(DISHES)},
+        "query_smu_notices_by_keyword": lambda: {"keyword": rng.choice(NOTICE_WORDS)},
+        "query_smu_exam": lambda: {"keyword": rng.choice(SUBJECTS)}
+        | ({"professor": rng.choice(PROFESSORS)} if rng.random() < 0.3 else {}),
+        "query_smu_schedule_by_keyword": lambda: {"keyword": rng.choice(EVENTS), "user_id": user()},
+        "query_smu_schedule_by_date": lambda: {"date_keyword": rng.choice(["오늘", "내일", "다음 주", "이번 달", day()]),
+                                               "user_id": user()},
+        "query_special_keywords": lambda: {"keyword": "김정찬"},
+        "today_bundle": lambda: {"user_id": user()} if rng.random() < 0.5 else {},
+        "batch_query": lambda: {"calls": [
+            {"id": "now", "tool": "now_kr"},
+            {"id": "lunch", "tool": "query_smu_meals_by_date_category", "args": {"date_iso": day(), "category": "lunch"}},
+            {"id": "schedule", "tool": "query_smu_schedule_by_date", "args": {"date_keyword": "오늘", "user_id": user()}},
+            {"id": "notices", "tool": "query_smu_notices_by_keyword", "args": {"keyword": rng.choice(NOTICE_WORDS), "limit": 5}},
+        ]},
+        "snapshot_status": lambda: {},
+        "add_smu_schedule_structured": lambda: {"start_datetime": f"{day()} 13:00", "content": f"벤치 일정 {rng.random():.6f}",
+                                                "user_id": user()},
+        "add_smu_schedules_bulk": lambda: {"user_id": user(), "skip_duplicates": True, "entries": [
+            {"start_datetime": f"{day()} {h:02d}:00", "content": f"시간표 {rng.choice(SUBJECTS)}"} for h in range(9, 17)
+        ]},
+        "delete_smu_schedule_by_content": lambda: {"content_keyword": "벤치 일정", "user_id": user()},
+        "delete_smu_schedules_by_ids": lambda: {"ids": [rng.randrange(1, 20000) for _ in range(5)], "user_id": user()},
+    }
+
+
+# ---- 서버 실행 / 부하 생성 ----
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="bench-uvicorn", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 15
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("uvicorn did not start in time")
+        time.sleep(0.05)
+    return server, thread
+
+
+def wait_ready(port: int, timeout: float = 30.0) -> float:
+    """/ready가 200을 줄 때까지 기다리고 걸린 시간(ms)을 반환 (lifespan 워밍업 시간)"""
+    import urllib.error
+    import urllib.request
+
+    started = time.perf_counter()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=5) as resp:
+                if resp.status == 200:
+                    return (time.perf_counter() - started) * 1000
+        except urllib.error.HTTPError as e:
+            if e.code != 503:
+                raise
+        if time.monotonic() > deadline:
+            raise RuntimeError("server did not become ready in time")
+        time.sleep(0.05)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+async def run_tool(sessions, tool: str, make_args, total: int, db: FakeDB, timeout: float) -> dict:
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(make_args())
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    response_bytes = 0
+
+    async def worker(session):
+        nonlocal response_bytes
+        while True:
+            try:
+                args = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            t0 = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(session.call_tool(tool, args), timeout)
+                if result.isError:
+                    message = result.content[0].text if result.content else "error"
+                    errors[message[:120]] = errors.get(message[:120], 0) + 1
+                response_bytes += sum(len(getattr(c, "text", "") or "") for c in result.content)
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    queries_before = db.queries
+    t_start = time.perf_counter()
+    await asyncio.gather(*(worker(s) for s in sessions))
+    elapsed = time.perf_counter() - t_start
+    queries = db.queries - queries_before
+    latencies.sort()
+    return {
+        "calls": total,
+        "errors": sum(errors.values()),
+        "error_samples": errors,
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "db_queries": queries,
+        "db_queries_per_call": round(queries / total, 3) if total else 0.0,
+        "response_bytes_per_call": round(response_bytes / total, 1) if total else 0.0,
+    }
+
+
+async def drive(url: str, args, scenarios: dict, db: FakeDB) -> dict:
+    from contextlib import AsyncExitStack
+
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamablehttp_client
+
+    results = {}
+    async with AsyncExitStack() as stack:
+        sessions = []
+        for _ in range(args.concurrency):
+            read, write, _ = await stack.enter_async_context(streamablehttp_client(url, timeout=args.timeout))
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+            sessions.append(session)
+
+        listed = {t.name for t in (await sessions[0].list_tools()).tools}
+        missing = sorted(listed - set(scenarios))
+        if missing:
+            print(f"[bench] no scenario for tools (skipped): {', '.join(missing)}", file=sys.stderr)
+        selected = [t for t in scenarios if t in listed and (not args.tools or t in args.tools)]
+
+        for tool in selected:
+            if args.warmup:
+                await run_tool(sessions, tool, scenarios[tool], args.warmup, db, args.timeout)
+            results[tool] = await run_tool(sessions, tool, scenarios[tool], args.requests, db, args.timeout)
+            r = results[tool]
+            print(f"[bench] {tool:36s} p50={r['p50_ms']:8.2f}ms p95={r['p95_ms']:8.2f}ms "
+                  f"p99={r['p99_ms']:8.2f}ms rps={r['throughput_rps']:8.1f} q/call={r['db_queries_per_call']:.2f} "
+                  f"err={r['errors']}", file=sys.stderr)
+    return results
+
+
+def cold_start(runs: int) -> dict:
+    """새 프로세스에서 서버 모듈을 import하는 시간 (컨테이너 콜드 스타트의 대부분)"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = "import lastdance1008, sys; sys.stdout.write(str(lastdance1008.IMPORT_SECONDS))"
+    imports, processes = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=here, check=True)
+        processes.append((time.perf_counter() - started) * 1000)
+        imports.append(float(out.stdout) * 1000)
+    budget = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+    result = {
+        "runs": runs,
+        "import_ms_p50": round(_percentile(sorted(imports), 50), 1),
+        "process_ms_p50": round(_percentile(sorted(processes), 50), 1),
+        "budget_ms": budget,
+    }
+    result["over_budget"] = result["import_ms_p50"] > budget
+    print(f"[bench] cold start: import p50={result['import_ms_p50']:.0f}ms "
+          f"process p50={result['process_ms_p50']:.0f}ms budget={budget:.0f}ms"
+          + (" OVER BUDGET" if result["over_budget"] else ""), file=sys.stderr)
+    return result
+
+
+def compare(previous_path: str, current: dict) -> None:
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)["tools"]
+    print(f"{'tool':36s} {'p50 Δ%':>9s} {'p95 Δ%':>9s} {'p99 Δ%':>9s} {'rps Δ%':>9s} {'q/call':>13s}")
+    for tool, cur in current["tools"].items():
+        old = previous.get(tool)
+        if not old:
+            continue
+
+        def delta(key):
+            return (cur[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+
+        print(f"{tool:36s} {delta('p50_ms'):+9.1f} {delta('p95_ms'):+9.1f} {delta('p99_ms'):+9.1f} "
+              f"{delta('throughput_rps'):+9.1f} {old['db_queries_per_call']:6.2f}→{cur['db_queries_per_call']:<6.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the smus MCP tools against a local database stand-in.")
+    parser.add_argument("--concurrency", type=int, default=8, help="number of concurrent MCP sessions")
+    parser.add_argument("--requests", type=int, default=200, help="measured calls per tool")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured calls per tool before measuring")
+    parser.add_argument("--scale", type=float, default=1.0, help="data volume multiplier (1.0 ≈ 1k meals, 5k notices, 2k exams, 20k schedules)")
+    parser.add_argument("--users", type=int, default=500, help="distinct user_ids for personal schedules")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated DB round-trip per query")
+    parser.add_argument("--connect-ms", type=float, default=0.0, help="simulated TCP/TLS/auth handshake per new connection")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-call timeout in seconds")
+    parser.add_argument("--tools", nargs="*", help="only benchmark these tools")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="server environment override (repeatable)")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed for data and arguments")
+    parser.add_argument("--output", default="bench_output.json", help="JSON results path")
+    parser.add_argument("--compare", metavar="PREVIOUS_JSON", help="print deltas against an earlier run")
+    parser.add_argument("--cold-start", type=int, default=3, metavar="RUNS",
+                        help="fresh-process import timings to record against IMPORT_TIME_BUDGET_MS (0 to skip)")
+    args = parser.parse_args()
+
+    for item in args.env:
+        key, _, value = item.partition("=")
+        os.environ[key] = value
+
+    cold = cold_start(args.cold_start) if args.cold_start > 0 else None
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="smus-bench-")
+    db = FakeDB(os.path.join(workdir, "smus.sqlite3"), args.latency_ms, args.connect_ms)
+    counts = seed(db.path, args.scale, args.users, rng)
+    db.connects = 0
+
+    # lastdance1008을 import 하기 전에 드라이버를 가짜 DB로 교체 (같은 연결 인터페이스)
+    pymysql.connect = db.connect
+    import lastdance1008
+
+    logging.disable(logging.INFO)  # 요청마다 찍히는 INFO 로그가 측정값을 왜곡하지 않도록
+    port = _free_port()
+    server, thread = start_server(lastdance1008.create_app(), port)
+    try:
+        ready_ms = wait_ready(port)
+        print(f"[bench] server ready after {ready_ms:.0f}ms (lifespan warm-up)", file=sys.stderr)
+        tools = asyncio.run(drive(f"http://127.0.0.1:{port}/mcp", args, build_scenarios(rng, args.users), db))
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        revision = None
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": revision,
+            "python": sys.version.split()[0],
+            "concurrency": args.concurrency,
+            "requests_per_tool": args.requests,
+            "latency_ms": args.latency_ms,
+            "connect_ms": args.connect_ms,
+            "scale": args.scale,
+            "seed": args.seed,
+            "env": dict(item.partition("=")[::2] for item in args.env),
+            "rows": counts,
+            "db_connections_opened": db.connects,
+            "db_queries_total": db.queries,
+            "cold_start": cold,
+            "ready_ms": round(ready_ms, 1),
+        },
+        "tools": tools,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[bench] wrote {args.output}", file=sys.stderr)
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+테스트 공용 픽스처: benchmark.py의 가짜 DB(SQLite, pymysql.connect 인터페이스 호환)로 DB 없이 툴 경로를 돌린다.
+"""
+import sqlite3
+
+import pymysql
+import pytest
+
+import lastdance1008
+from benchmark import SCHEMA, FakeDB
+
+
+@pytest.fixture
+def fake_db(tmp_path, monkeypatch):
+    """빈 스키마의 가짜 DB에 연결하고 모듈 전역 상태(풀/캐시/일정 뷰/오늘 묶음)를 비운다. 행을 넣을 raw 연결을 돌려준다"""
+    db = FakeDB(str(tmp_path / "smus.sqlite3"))
+    raw = sqlite3.connect(db.path, isolation_level=None)
+    raw.executescript(SCHEMA)
+    monkeypatch.setenv("PREWARM_ENABLED", "0")
+    monkeypatch.setattr(pymysql, "connect", db.connect)
+    monkeypatch.setattr(lastdance1008, "_POOL", None)
+    monkeypatch.setattr(lastdance1008, "_SCHEDULE_VIEW", None)
+    monkeypatch.setattr(lastdance1008, "_TODAY_BUNDLE", None)
+    monkeypatch.setattr(lastdance1008, "_TODAY_BUNDLE_AT", 0.0)
+    lastdance1008._RESULT_CACHE.clear()
+    yield raw
+    if lastdance1008._POOL is not None:
+        lastdance1008._POOL.close()
+    lastdance1008._RESULT_CACHE.clear()
+    raw.close()
+
+
+def insert_schedules(raw, rows) -> None:
+    """(id, start_date, end_date, type, user_id) 목록을 smu_schedule에 넣는다"""
+    raw.executemany(
+        "INSERT INTO smu_schedule (id, start_date, end_date, content, type, user_id, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(i, start, end, f"일정 {i}", kind, user, start) for i, start, end, kind, user in rows],
+    )
@@ -1,13 +1,40 @@
+# 콜드 스타트 측정용: 다른 import보다 먼저 시각을 잡는다
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.prompts import base
+import asyncio
+import base64
+import bisect
+import contextvars
+import functools
+import heapq
+import inspect
+import itertools
+import json
+import logging
 import os
-import pandas as pd
+import re
+import sqlite3
+import tempfile
+import threading
 import pymysql
-from datetime import datetime, timedelta
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
 from zoneinfo import ZoneInfo
+from pymysql.constants import FIELD_TYPE, SERVER_STATUS
 from pymysql.cursors import DictCursor
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
 from typing import Optional
 
+logger = logging.getLogger("smus")
+
 # ---- DB 설정 (가능하면 환경변수로 관리 권장) ----
 # Smithery에서 URL 파라미터로 전달되는 설정을 환경변수로 변환
 def get_db_config():
@@ -20,46 +47,1223 @@ def get_db_config():
         "port": int(os.getenv("DB_PORT", "3306"))
     }
 
-# 전역 DB 설정
-DB_CONFIG = get_db_config()
-DB_HOST = DB_CONFIG["host"]
-DB_USER = DB_CONFIG["user"]
-DB_PASSWORD = DB_CONFIG["password"]
-DB_NAME = DB_CONFIG["database"]
-DB_PORT = DB_CONFIG["port"]
+# ---- 커넥션 풀 ----
+# 모든 툴이 프로세스 전역 풀에서 커넥션을 빌려 쓴다.
+# (RDS까지의 TCP/TLS/인증 핸드셰이크를 호출마다 반복하지 않기 위함)
+def get_worker_count() -> int:
+    """HTTP 워커 프로세스 수 (HTTP_WORKERS, 기본 1)"""
+    return max(1, int(os.getenv("HTTP_WORKERS", "1")))
 
-def _query_meals_by_date_category(date_iso: str, category: str) -> list[dict]:
+
+def get_pool_config():
     """
-    내부 헬퍼: YYYY-MM-DD(iso) 날짜와 카테고리(breakfast/lunch/dinner)로 smu_meals 조회
-    - date 컬럼이 DATE/DATETIME이거나 문자열(텍스트)인 경우 모두 대응
+    커넥션 풀 설정을 환경변수에서 읽어오는 함수 (풀은 워커 프로세스마다 하나)
+    DB_POOL_MAX_TOTAL이 있으면 워커 수로 나눠 워커당 상한으로 쓴다 (DB 전체 커넥션 수를 고정할 때)
     """
-    conn = pymysql.connect(
-        host=DB_HOST, user=DB_USER, password=DB_PASSWORD,
-        database=DB_NAME, port=DB_PORT, cursorclass=DictCursor, charset="utf8mb4"
-    )
+    total = os.getenv("DB_POOL_MAX_TOTAL")
+    maxsize = max(1, int(total) // get_worker_count()) if total else int(os.getenv("DB_POOL_MAX", "10"))
+    return {
+        "minsize": min(int(os.getenv("DB_POOL_MIN", "1")), maxsize),
+        "maxsize": maxsize,
+        "recycle": float(os.getenv("DB_POOL_RECYCLE", "3600")),
+        "idle_timeout": float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300")),
+        "ping_interval": float(os.getenv("DB_POOL_PING_INTERVAL", "30")),
+        "acquire_timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+    }
+
+
+def get_db_timeout_config():
+    """
+    DB 타임아웃 설정을 환경변수에서 읽어오는 함수
+    - 클라이언트: 접속/소켓 읽기/쓰기 타임아웃 (초)
+    - 서버: 세션 MAX_EXECUTION_TIME (밀리초, SELECT에 적용, 0이면 끔). 클라이언트 read 타임아웃보다 짧게 둬야
+      서버가 먼저 쿼리를 끊고 커넥션은 살아남는다
+    """
+    return {
+        "connect_timeout": float(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+        "read_timeout": float(os.getenv("DB_READ_TIMEOUT", "15")),
+        "write_timeout": float(os.getenv("DB_WRITE_TIMEOUT", "15")),
+        "max_execution_ms": int(os.getenv("DB_MAX_EXECUTION_MS", "10000")),
+    }
+
+
+def _db_connect_kwargs() -> dict:
+    config = get_db_timeout_config()
+    kwargs = {k: config[k] for k in ("connect_timeout", "read_timeout", "write_timeout")}
+    if config["max_execution_ms"] > 0:
+        kwargs["init_command"] = f"SET SESSION MAX_EXECUTION_TIME={config['max_execution_ms']}"
+    return kwargs
+
+
+# 타임아웃으로 끊긴 쿼리를 나타내는 MySQL 오류 코드
+ER_QUERY_TIMEOUT = 3024       # 서버: maximum statement execution time exceeded
+CR_SERVER_LOST = 2013         # 클라이언트: Lost connection ... (timed out)
+
+
+def _timeout_kind(error: BaseException) -> Optional[str]:
+    """DB 오류가 타임아웃이면 'server' / 'client', 아니면 None"""
+    code = error.args[0] if isinstance(error, pymysql.err.MySQLError) and error.args else None
+    if code == ER_QUERY_TIMEOUT:
+        return "server"
+    if code == CR_SERVER_LOST and "timed out" in str(error):
+        return "client"
+    return None
+
+
+class PoolTimeoutError(RuntimeError):
+    """풀에서 제한 시간 안에 커넥션을 얻지 못했을 때 발생"""
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 pymysql 커넥션 풀.
+    - minsize ~ maxsize 개의 커넥션을 유지
+    - 일정 시간 쉬었던 커넥션은 빌려주기 전에 ping으로 상태 확인
+    - recycle(생성 후 경과) / idle_timeout(유휴 경과)을 넘긴 커넥션은 폐기 후 재생성
+    - 대기 횟수/시간 등 메트릭 제공 (stats)
+    """
+
+    def __init__(self, db_config: dict, minsize: int = 1, maxsize: int = 10,
+                 recycle: float = 3600, idle_timeout: float = 300,
+                 ping_interval: float = 30, acquire_timeout: float = 10):
+        if maxsize < 1 or minsize < 0 or minsize > maxsize:
+            raise ValueError(f"Invalid pool size: min={minsize}, max={maxsize}")
+        self._db_config = db_config
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.recycle = recycle
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.acquire_timeout = acquire_timeout
+        self._cond = threading.Condition()
+        self._idle: deque = deque()  # (conn, created_at, last_used_at)
+        self._created_at: dict[int, float] = {}
+        self._size = 0
+        self._closed = False
+        self._stats = {
+            "acquired": 0,
+            "created": 0,
+            "recycled": 0,
+            "health_check_failures": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "timeouts": 0,
+        }
+
+    def _connect(self):
+        # 읽기는 매번 최신 데이터를 보도록 autocommit, 쓰기는 begin()/commit()으로 명시
+        started = time.perf_counter()
+        conn = pymysql.connect(
+            **self._db_config, cursorclass=DictCursor, charset="utf8mb4", autocommit=True
+        )
+        METRICS.observe("smus_db_connect_seconds", time.perf_counter() - started)
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats["created"] += 1
+        return conn
+
+    def _discard(self, conn, stat: Optional[str] = None) -> None:
+        """커넥션을 닫고 풀 크기를 줄인다 (close는 락 밖에서; 호출자가 _cond를 잡고 있으면 안 됨)"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._created_at.pop(id(conn), None)
+            if stat:
+                self._stats[stat] += 1
+            self._size -= 1
+            self._cond.notify()
+
+    def _is_expired(self, created: float, last_used: float, now: float) -> bool:
+        if self.recycle and now - created > self.recycle:
+            return True
+        return bool(self.idle_timeout) and now - last_used > self.idle_timeout
+
+    def fill(self) -> None:
+        """minsize까지 커넥션을 미리 만들어 둔다"""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.minsize:
+                    return
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            now = time.monotonic()
+            with self._cond:
+                self._idle.append((conn, now, now))
+                self._cond.notify()
+
+    def acquire(self, timeout: Optional[float] = None):
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited_from = None
+        while True:
+            conn = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+                    now = time.monotonic()
+                    if self._idle:
+                        conn, created, last_used = self._idle.pop()  # LIFO: 가장 최근 커넥션 우선
+                        break
+                    if self._size < self.maxsize:
+                        self._size += 1
+                        self._record_acquire(waited_from)
+                        break
+                    if waited_from is None:
+                        waited_from = now
+                        self._stats["waits"] += 1
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        METRICS.inc("smus_db_timeouts_total", tool=_CURRENT_TOOL.get(), kind="pool")
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout:.1f}s waiting for a DB connection "
+                            f"(pool max={self.maxsize})"
+                        )
+                    self._cond.wait(remaining)
+            if conn is None:
+                break
+            # 꺼낸 커넥션의 만료 확인/ping/close는 락 밖에서 (원격 DB의 느린 ping이 다른 acquire/release를 막지 않도록)
+            if self._is_expired(created, last_used, now):
+                self._discard(conn, "recycled")
+                continue
+            if now - last_used > self.ping_interval:
+                try:
+                    conn.ping(reconnect=False)
+                except Exception:
+                    self._discard(conn, "health_check_failures")
+                    continue
+            with self._cond:
+                self._record_acquire(waited_from)
+            return conn
+        # 새 커넥션 생성은 락 밖에서 (핸드셰이크 동안 다른 스레드를 막지 않도록)
+        try:
+            return self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def _record_acquire(self, waited_from: Optional[float]) -> None:
+        self._stats["acquired"] += 1
+        if waited_from is not None:
+            waited = time.monotonic() - waited_from
+            self._stats["wait_time_total"] += waited
+            self._stats["wait_time_max"] = max(self._stats["wait_time_max"], waited)
+
+    def release(self, conn, discard: bool = False) -> None:
+        if not discard:
+            try:
+                # 커밋/롤백되지 않은 트랜잭션이 남아 있으면 정리해서 돌려받는다
+                if conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                    conn.rollback()
+            except Exception:
+                discard = True
+        with self._cond:
+            if not (discard or self._closed):
+                created = self._created_at.get(id(conn), time.monotonic())
+                self._idle.append((conn, created, time.monotonic()))
+                self._cond.notify()
+                return
+        self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        """with pool.connection() as conn: ... 형태로 빌리고 자동 반납"""
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError) as e:
+            # 끊긴 커넥션은 풀로 돌려보내지 않는다
+            # (서버 MAX_EXECUTION_TIME 취소는 쿼리만 끊기고 커넥션은 멀쩡하므로 재사용)
+            discard = _timeout_kind(e) != "server"
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._stats,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "minsize": self.minsize,
+                "maxsize": self.maxsize,
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+
+_POOL: Optional[ConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """프로세스 전역 커넥션 풀 (첫 사용 시 생성)"""
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ConnectionPool({**get_db_config(), **_db_connect_kwargs()}, **get_pool_config())
+    return _POOL
+
+
+@contextmanager
+def _db_conn():
+    """풀에서 커넥션을 빌려오는 컨텍스트 매니저 (대기 시간과 쿼리 시간을 계측)"""
+    started = time.perf_counter()
+    with get_pool().connection() as conn:
+        METRICS.observe("smus_db_acquire_seconds", time.perf_counter() - started, tool=_CURRENT_TOOL.get())
+        yield _InstrumentedConnection(conn)
+
+# ---- 로컬 스냅샷 (읽기 전용 복제본) ----
+# SNAPSHOT_MODE=1이면 smu_meals / smu_notices / smu_exam / smu_schedule(common 행)을
+# 로컬 SQLite 파일(mmap)로 복제해 읽기 툴이 원격 RDS 대신 여기서 답한다. 쓰기는 계속 MySQL로 간다.
+# 시작 시 전체 동기화, 이후 id 하이워터마크 기준 증분 동기화 + 주기적 전체 동기화(삭제/수정 반영).
+# DB에 닿지 않아도 이전 스냅샷 파일이 있으면 그걸로 계속 응답한다.
+def get_snapshot_config():
+    """로컬 스냅샷 설정을 환경변수에서 읽어오는 함수"""
+    return {
+        "enabled": os.getenv("SNAPSHOT_MODE", "0").lower() in ("1", "true", "yes", "on"),
+        "path": os.getenv("SNAPSHOT_PATH", os.path.join(tempfile.gettempdir(), "smus_snapshot.sqlite3")),
+        "sync_interval": float(os.getenv("SNAPSHOT_SYNC_INTERVAL", "30")),
+        "full_sync_interval": float(os.getenv("SNAPSHOT_FULL_SYNC_INTERVAL", "3600")),
+        "mmap_size": int(os.getenv("SNAPSHOT_MMAP_BYTES", str(256 * 1024 * 1024))),
+    }
+
+
+# 복제 대상: 테이블 → 원본에서 가져올 행 조건
+SNAPSHOT_TABLES = {
+    "smu_meals": "",
+    "smu_notices": "",
+    "smu_exam": "",
+    "smu_schedule": "WHERE type = 'common'",
+}
+
+# pymysql 타입 코드 → 스냅샷 컬럼 선언 타입 (읽을 때 원래 파이썬 타입으로 되돌리기 위함)
+_SNAPSHOT_DECLTYPES = {
+    FIELD_TYPE.DATETIME: "SNAP_DATETIME",
+    FIELD_TYPE.TIMESTAMP: "SNAP_DATETIME",
+    FIELD_TYPE.DATE: "SNAP_DATE",
+    FIELD_TYPE.DECIMAL: "SNAP_DECIMAL",
+    FIELD_TYPE.NEWDECIMAL: "SNAP_DECIMAL",
+}
+# 문자열 컬럼은 MySQL 기본 collation처럼 대소문자 무시로 비교
+_SNAPSHOT_TEXT_TYPES = {
+    FIELD_TYPE.VARCHAR, FIELD_TYPE.VAR_STRING, FIELD_TYPE.STRING,
+    FIELD_TYPE.BLOB, FIELD_TYPE.TINY_BLOB, FIELD_TYPE.MEDIUM_BLOB, FIELD_TYPE.LONG_BLOB,
+}
+sqlite3.register_converter("SNAP_DATETIME", lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter("SNAP_DATE", lambda b: date.fromisoformat(b.decode()))
+sqlite3.register_converter("SNAP_DECIMAL", lambda b: Decimal(b.decode()))
+
+
+def _snapshot_value(value):
+    """원본 값을 SQLite에 저장할 값으로 (정렬/비교가 MySQL과 같도록 'YYYY-MM-DD HH:MM:SS' 문자열)"""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, (date, Decimal, timedelta)):
+        return str(value)
+    return value
+
+
+def _snapshot_column(d) -> str:
+    """cursor.description 한 항목 → 스냅샷 테이블 컬럼 정의"""
+    if d[1] in _SNAPSHOT_TEXT_TYPES:
+        return f'"{d[0]}" TEXT COLLATE NOCASE'
+    return f'"{d[0]}" {_SNAPSHOT_DECLTYPES.get(d[1], "")}'.rstrip()
+
+
+class _SnapshotCursor:
+    """pymysql DictCursor와 같은 모양으로 쓰는 SQLite 커서 (%s 플레이스홀더 변환)"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._cur = conn.cursor()
+        self._rows: list[dict] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cur.close()
+
+    def execute(self, sql: str, params=None) -> int:
+        self._cur.execute(sql.replace("%s", "?").replace("%%", "%"), tuple(params or ()))
+        names = [d[0] for d in self._cur.description or ()]
+        self._rows = [dict(zip(names, r)) for r in self._cur.fetchall()] if names else []
+        return len(self._rows)
+
+    def fetchall(self) -> list[dict]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self) -> Optional[dict]:
+        return self._rows.pop(0) if self._rows else None
+
+
+class _SnapshotConnection:
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs) -> _SnapshotCursor:
+        return _SnapshotCursor(self._conn)
+
+
+class SnapshotStore:
+    """MySQL → 로컬 SQLite(mmap) 복제본"""
+
+    def __init__(self, path: str, mmap_size: int):
+        self.path = path
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._state: dict[str, dict] = {}
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.close()
+        with self._writer() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _sync_state ("
+                " tbl TEXT PRIMARY KEY, max_id INTEGER, rows INTEGER,"
+                " last_sync_at REAL, last_full_sync_at REAL)"
+            )
+            for tbl, max_id, rows, last_sync, last_full in conn.execute("SELECT * FROM _sync_state"):
+                self._state[tbl] = {
+                    "max_id": max_id, "rows": rows, "last_sync_at": last_sync,
+                    "last_full_sync_at": last_full, "last_error": None,
+                }
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                               detect_types=sqlite3.PARSE_DECLTYPES)
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        return conn
+
+    @contextmanager
+    def _writer(self):
+        """쓰기 트랜잭션. BEGIN IMMEDIATE라서 같은 파일을 쓰는 여러 워커 프로세스의 동기화가 순서대로 실행된다"""
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _reader(self) -> sqlite3.Connection:
+        """스레드별 읽기 커넥션 (mmap으로 페이지를 직접 읽음)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def has(self, table: str) -> bool:
+        return self._state.get(table, {}).get("last_sync_at") is not None
+
+    @contextmanager
+    def connection(self):
+        yield _InstrumentedConnection(_SnapshotConnection(self._reader()))
+
+    def _fetch_source(self, table: str, after_id: Optional[int]):
+        where = SNAPSHOT_TABLES[table]
+        sql = f"SELECT * FROM {table} {where}"
+        params: tuple = ()
+        if after_id is not None:
+            sql += (" AND" if where else " WHERE") + " id > %s ORDER BY id ASC"
+            params = (after_id,)
+        with _db_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                return cur.description, cur.fetchall()
+
+    def sync(self, table: str, full: bool = False) -> int:
+        """원본에서 가져와 반영하고 반영한 행 수를 돌려준다 (full=False면 하이워터마크 이후 행만)"""
+        with self._sync_lock:
+            state = self._state.get(table)
+            full = full or not self.has(table)
+            try:
+                description, rows = self._fetch_source(table, None if full else state["max_id"])
+            except Exception as e:
+                self._state.setdefault(table, {"last_sync_at": None})["last_error"] = f"{type(e).__name__}: {e}"
+                raise
+            columns = [d[0] for d in description]
+            now = time.time()
+            with self._writer() as conn:
+                if full:
+                    decls = ", ".join(_snapshot_column(d) for d in description)
+                    conn.execute(f"DROP TABLE IF EXISTS {table}__new")
+                    conn.execute(f"CREATE TABLE {table}__new ({decls}, PRIMARY KEY (id))")
+                    target = f"{table}__new"
+                else:
+                    target = table
+                if rows:
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO {target} ({', '.join(chr(34) + c + chr(34) for c in columns)}) "
+                        f"VALUES ({', '.join('?' * len(columns))})",
+                        [tuple(_snapshot_value(r[c]) for c in columns) for r in rows],
+                    )
+                if full:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                    conn.execute(f"ALTER TABLE {table}__new RENAME TO {table}")
+                    self._create_indexes(conn, table)
+                max_id, count = conn.execute(f"SELECT COALESCE(MAX(id), 0), COUNT(*) FROM {table}").fetchone()
+                last_full = now if full else state["last_full_sync_at"]
+                conn.execute(
+                    "INSERT OR REPLACE INTO _sync_state VALUES (?, ?, ?, ?, ?)",
+                    (table, max_id, count, now, last_full),
+                )
+            self._state[table] = {
+                "max_id": max_id, "rows": count, "last_sync_at": now,
+                "last_full_sync_at": last_full, "last_error": None,
+            }
+            return len(rows)
+
+    @staticmethod
+    def _create_indexes(conn: sqlite3.Connection, table: str) -> None:
+        if table == "smu_meals":
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_smu_meals_category_date ON smu_meals (category, `date`)")
+        elif table == "smu_schedule":
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_smu_schedule_start ON smu_schedule (start_date, id)")
+
+    def sync_all(self, full: bool = False) -> dict[str, int]:
+        results = {}
+        for table in SNAPSHOT_TABLES:
+            try:
+                results[table] = self.sync(table, full=full)
+            except Exception as e:
+                logger.warning("snapshot sync of %s failed: %s", table, e)
+        return results
+
+    def status(self) -> dict:
+        now = time.time()
+
+        def iso(ts):
+            return datetime.fromtimestamp(ts, KST).isoformat() if ts else None
+
+        return {
+            table: {
+                "rows": s.get("rows"),
+                "max_id": s.get("max_id"),
+                "last_sync_at": iso(s.get("last_sync_at")),
+                "last_full_sync_at": iso(s.get("last_full_sync_at")),
+                "lag_seconds": round(now - s["last_sync_at"], 1) if s.get("last_sync_at") else None,
+                "last_error": s.get("last_error"),
+            }
+            for table, s in ((t, self._state.get(t, {})) for t in SNAPSHOT_TABLES)
+        }
+
+
+_SNAPSHOT: Optional[SnapshotStore] = None
+_SNAPSHOT_LOCK = threading.Lock()
+
+
+def _snapshot_sync_loop(store: SnapshotStore, config: dict) -> None:
+    _CURRENT_TOOL.set("background:snapshot")
+    while True:
+        time.sleep(config["sync_interval"])
+        due_full = any(
+            time.time() - (s.get("last_full_sync_at") or 0) >= config["full_sync_interval"]
+            for s in (store._state.get(t, {}) for t in SNAPSHOT_TABLES)
+        )
+        store.sync_all(full=due_full)
+
+
+def get_snapshot() -> Optional[SnapshotStore]:
+    """스냅샷 모드면 저장소를 돌려준다 (첫 호출 시 전체 동기화 후 백그라운드 동기화 시작)"""
+    global _SNAPSHOT
+    config = get_snapshot_config()
+    if not config["enabled"]:
+        return None
+    if _SNAPSHOT is None:
+        with _SNAPSHOT_LOCK:
+            if _SNAPSHOT is None:
+                store = SnapshotStore(config["path"], config["mmap_size"])
+                store.sync_all(full=True)
+                threading.Thread(
+                    target=_snapshot_sync_loop, args=(store, config), name="smus-snapshot-sync", daemon=True
+                ).start()
+                _SNAPSHOT = store
+    return _SNAPSHOT
+
+
+def _read_conn(table: str):
+    """
+    읽기용 커넥션: 스냅샷 모드이고 테이블 전체가 동기화돼 있으면 로컬 스냅샷, 아니면 MySQL 풀
+    (smu_schedule처럼 일부 행만 복제하는 테이블은 호출부에서 get_snapshot()으로 직접 나눠 읽는다)
+    """
+    store = get_snapshot()
+    if store is not None and not SNAPSHOT_TABLES.get(table, "-") and store.has(table):
+        return store.connection()
+    return _db_conn()
+
+
+# ---- 결과 캐시 (TTL + LRU) ----
+# 식단/공지/시험 정보는 하루에 몇 번 바뀌지 않으므로 툴 결과를 프로세스 메모리에 캐시한다.
+# 키: (툴/헬퍼 이름, 정규화된 인자), 테이블별 TTL, 크기 초과 시 LRU 방출.
+# smu_schedule 쓰기(add/delete) 시에는 해당 user_id의 일정 캐시만 정확히 무효화한다.
+def get_cache_config():
+    """결과 캐시 설정을 환경변수에서 읽어오는 함수 (TTL 0이면 해당 테이블 캐시 비활성화)"""
+    return {
+        "maxsize": int(os.getenv("CACHE_MAXSIZE", "1024")),
+        "ttls": {
+            "smu_meals": float(os.getenv("CACHE_TTL_MEALS", "600")),
+            "smu_notices": float(os.getenv("CACHE_TTL_NOTICES", "300")),
+            "smu_exam": float(os.getenv("CACHE_TTL_EXAM", "600")),
+            "smu_schedule": float(os.getenv("CACHE_TTL_SCHEDULE", "60")),
+        },
+    }
+
+
+class TTLCache:
+    """
+    스레드 안전한 TTL + LRU 캐시.
+    각 항목은 (table, user_id) 태그를 가져 테이블/사용자 단위 무효화가 가능하다.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttls: Optional[dict] = None):
+        self.maxsize = maxsize
+        self.ttls = dict(ttls or {})
+        self._data: OrderedDict = OrderedDict()  # key -> (expires_at, table, user_id, value)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def enabled(self, table: str) -> bool:
+        return self.maxsize > 0 and self.ttls.get(table, 0) > 0
+
+    def get(self, key):
+        """(hit 여부, 값) 반환"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return False, None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, entry[3]
+
+    def set(self, key, value, table: str, user_id: Optional[str] = None) -> None:
+        if not self.enabled(table):
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttls[table], table, user_id, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, table: str, user_id: Optional[str] = None) -> int:
+        """table의 항목을 무효화 (user_id가 주어지면 그 사용자 태그가 붙은 항목만)"""
+        with self._lock:
+            keys = [
+                k for k, (_, t, uid, _) in self._data.items()
+                if t == table and (user_id is None or uid == user_id)
+            ]
+            for k in keys:
+                del self._data[k]
+            self._stats["invalidations"] += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._data), "maxsize": self.maxsize}
+
+
+_RESULT_CACHE = TTLCache(**get_cache_config())
+
+
+# ---- 동일 요청 합치기 (single-flight) ----
+# 점심시간처럼 같은 인자의 조회가 동시에 몰리면, 먼저 온 호출(leader)만 DB에 가고
+# 나머지(follower)는 그 결과를 기다렸다가 그대로 받는다. 캐시 TTL과 무관하게 동작한다.
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT", "1").lower() not in ("0", "false", "no", "off")
+
+
+class _Flight:
+    __slots__ = ("event", "value", "error", "followers", "stale")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+        self.stale = False
+
+
+class SingleFlight:
+    """키별로 진행 중인 호출을 하나만 유지하고 동시 호출자에게 같은 결과(또는 예외)를 돌려준다"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: dict = {}  # key -> (flight, table, user_id)
+
+    def do(self, key, fn, table: str, user_id: Optional[str] = None) -> tuple:
+        """(값, 캐시에 넣어도 되는지) 반환. follower이거나 도중에 무효화됐으면 두 번째 값은 False"""
+        with self._lock:
+            entry = self._flights.get(key)
+            if entry is None:
+                flight = _Flight()
+                self._flights[key] = (flight, table, user_id)
+                leader = True
+            else:
+                flight = entry[0]
+                flight.followers += 1
+                leader = False
+        name = key[0]
+        if not leader:
+            METRICS.inc("smus_singleflight_calls_total", fn=name, role="follower")
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, False
+        METRICS.inc("smus_singleflight_calls_total", fn=name, role="leader")
+        try:
+            flight.value = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key, (None,))[0] is flight:
+                    del self._flights[key]
+            flight.event.set()
+        return flight.value, not flight.stale
+
+    def forget(self, table: str, user_id: Optional[str] = None) -> None:
+        """쓰기 직후 호출: 진행 중인 조회를 떼어내 이후 호출은 새로 조회하고, 그 결과는 캐시에 넣지 않는다"""
+        with self._lock:
+            for key, (flight, t, uid) in list(self._flights.items()):
+                if t == table and (user_id is None or uid == user_id):
+                    flight.stale = True
+                    del self._flights[key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+
+_SINGLE_FLIGHT = SingleFlight()
+
+
+def _invalidate_results(table: str, user_id: Optional[str] = None) -> None:
+    """쓰기 후 결과 캐시와 진행 중인 동일 조회를 함께 무효화"""
+    _RESULT_CACHE.invalidate(table, user_id)
+    _SINGLE_FLIGHT.forget(table, user_id)
+
+
+def _normalize_cache_arg(value):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_normalize_cache_arg(v) for v in value)
+    return value
+
+
+def cached(table: str):
+    """
+    결과 캐시 데코레이터. 인자를 시그니처 기준으로 정규화(기본값 적용, 문자열 strip, 리스트→튜플)해 키를 만든다.
+    user_id 인자가 있으면 그 값으로 태그를 달아 사용자 단위 무효화에 쓴다.
+    캐시 미스는 같은 키끼리 single-flight로 합쳐 한 번만 실행한다.
+    """
+    def decorator(fn):
+        sig = inspect.signature(fn)
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            caching = _RESULT_CACHE.enabled(table)
+            if not caching and not SINGLE_FLIGHT_ENABLED:
+                return fn(*args, **kwargs)
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, tuple((k, _normalize_cache_arg(v)) for k, v in bound.arguments.items()))
+            user_id = bound.arguments.get("user_id")
+            if caching:
+                hit, value = _RESULT_CACHE.get(key)
+                if hit:
+                    return value
+            if SINGLE_FLIGHT_ENABLED:
+                value, fresh = _SINGLE_FLIGHT.do(key, lambda: fn(*args, **kwargs), table, user_id)
+            else:
+                value, fresh = fn(*args, **kwargs), True
+            if caching and fresh:
+                _RESULT_CACHE.set(key, value, table, user_id)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+# ---- 페이지네이션 / 컬럼 프로젝션 ----
+# 조회 툴은 limit 만큼만 반환하고, 다음 페이지는 불투명한 keyset 커서(next_cursor)로 이어 받는다.
+# 커서는 마지막 행의 정렬 키이므로 OFFSET 없이 "그 다음"부터 읽는다.
+DEFAULT_PAGE_LIMIT = int(os.getenv("PAGE_LIMIT_DEFAULT", "50"))
+MAX_PAGE_LIMIT = int(os.getenv("PAGE_LIMIT_MAX", "200"))
+
+
+def _clamp_limit(limit: Optional[int]) -> int:
+    if limit is None:
+        return DEFAULT_PAGE_LIMIT
+    return max(1, min(int(limit), MAX_PAGE_LIMIT))
+
+
+def _encode_cursor(key) -> Optional[str]:
+    if key is None:
+        return None
+    raw = json.dumps(list(key), ensure_ascii=False, default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+# 커서 모양 (정렬 키의 원소 타입): 검색 인덱스 (-점수, 정렬값, id) / 일정 구간 (start_date, id)
+_SEARCH_CURSOR = (float, str, int)
+_INTERVAL_CURSOR = (str, int)
+
+
+def _decode_cursor(cursor: Optional[str], shape: tuple) -> Optional[tuple]:
+    """next_cursor를 정렬 키로 되돌린다. 모양이 다르면 (다른 툴의 커서 등) ValueError"""
+    if not cursor:
+        return None
     try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = tuple(json.loads(raw.decode("utf-8")))
+        if len(key) == len(shape) and all(
+            isinstance(v, (int, float) if t is float else t) and not isinstance(v, bool)
+            for v, t in zip(key, shape)
+        ):
+            return key
+    except Exception:
+        pass
+    raise ValueError(f"Invalid cursor: {cursor!r}. Pass next_cursor from a previous response of the same tool as-is.")
+
+
+def _project(row: dict, fields: Optional[list[str]]) -> dict:
+    """fields에 지정된 컬럼만 남긴다 (없는 컬럼이면 사용 가능한 컬럼 목록과 함께 ValueError)"""
+    if not fields:
+        return row
+    unknown = [f for f in fields if f not in row]
+    if unknown:
+        raise ValueError(f"Unknown fields: {unknown}. Available: {list(row)}")
+    return {f: row[f] for f in fields}
+
+
+# ---- 응답 인코딩 ----
+# 모든 조회 툴이 같은 인코더를 쓴다. 날짜/시간은 항상 ISO 문자열로 정규화한다.
+# - "rows"(기본): 행마다 {컬럼: 값}
+# - "columnar": 컬럼 이름을 한 번만 싣고 행은 값 배열 → 큰 결과에서 바이트/토큰 절감
+RESPONSE_FORMATS = ("rows", "columnar")
+DEFAULT_RESPONSE_FORMAT = os.getenv("RESPONSE_FORMAT", "rows").strip().lower()
+
+
+def _resolve_format(format: Optional[str]) -> str:
+    fmt = (format or DEFAULT_RESPONSE_FORMAT).strip().lower()
+    if fmt not in RESPONSE_FORMATS:
+        raise ValueError(f"Unknown format: {format!r}. Use one of {list(RESPONSE_FORMATS)}.")
+    return fmt
+
+
+def _json_value(value):
+    """DB 값을 JSON 친화적인 값으로 (datetime/date/time → ISO 문자열, Decimal → 숫자, TIME(timedelta) → 'HH:MM:SS')"""
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, timedelta):
+        total = int(value.total_seconds())
+        return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}"
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", errors="replace")
+    return value
+
+
+def encode_rows(rows: list[dict], fields: Optional[list[str]] = None, format: Optional[str] = None) -> dict:
+    """
+    행 목록을 응답 형식으로 인코딩.
+    rows → { items: [{...}, ...] }, columnar → { columns: [...], rows: [[...], ...] }
+    """
+    projected = [_project(row, fields) for row in rows]
+    if _resolve_format(format) == "columnar":
+        columns = list(fields) if fields else list(dict.fromkeys(k for row in projected for k in row))
+        return {
+            "columns": columns,
+            "rows": [[_json_value(row.get(c)) for c in columns] for row in projected],
+        }
+    return {"items": [{k: _json_value(v) for k, v in row.items()} for row in projected]}
+
+
+def _page(rows: list[dict], next_key, fields: Optional[list[str]] = None, format: Optional[str] = None) -> dict:
+    """조회 툴 공통 응답: { items | columns+rows, count, next_cursor } (next_cursor가 null이면 마지막 페이지)"""
+    return {**encode_rows(rows, fields, format), "count": len(rows), "next_cursor": _encode_cursor(next_key)}
+
+
+# ---- 검색 인덱스 (공백 무시 문자 n-gram) ----
+# 키워드 툴의 LIKE '%kw%'는 매번 풀 스캔이고, '점심메뉴' vs '점심 메뉴' 같은 띄어쓰기 변형도 못 잡는다.
+# 테이블을 메모리에 올려 공백 제거/소문자화한 텍스트의 bigram 역색인을 만들고,
+# 키워드 툴은 MySQL 대신 이 인덱스에서 답한다.
+# - 첫 사용 시 전체 적재, 이후 백그라운드 스레드가 id 하이워터마크 기준으로 증분 갱신
+# - 삭제/수정 반영을 위해 주기적으로 전체 재적재, 이 서버를 통한 일정 쓰기는 즉시 반영
+SEARCH_NGRAM = 2
+
+
+def get_search_index_config():
+    """검색 인덱스 갱신 주기(초)를 환경변수에서 읽어오는 함수"""
+    return {
+        "refresh_interval": float(os.getenv("SEARCH_INDEX_REFRESH", "60")),
+        "full_refresh_interval": float(os.getenv("SEARCH_INDEX_FULL_REFRESH", "3600")),
+    }
+
+
+def _normalize_search_text(value) -> str:
+    """공백을 모두 제거하고 소문자화 ('점심 메뉴' == '점심메뉴')"""
+    return "".join(str(value).split()).lower() if value is not None else ""
+
+
+def _ngrams(text: str, n: int = SEARCH_NGRAM) -> set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    """
+    한 테이블의 지정 컬럼들에 대한 문자 n-gram 역색인.
+    postings[field][gram] = {id, ...} 후보를 교집합한 뒤, 정규화 텍스트 부분 문자열 여부로 최종 확인한다.
+    where를 주면 그 조건에 맞는 행만 색인한다 (SQL 조건식).
+    """
+
+    def __init__(self, table: str, fields: tuple[str, ...], where: Optional[str] = None):
+        self.table = table
+        self.fields = fields
+        self.where = where
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # 첫 적재 중복 방지 (DB 읽기 동안 _lock은 잡지 않는다)
+        self._reset()
+        self.loaded_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+
+    def _reset(self) -> None:
+        self._rows: dict = {}
+        self._norm: dict = {}
+        self._postings: dict[str, dict[str, set]] = {f: {} for f in self.fields}
+        self._max_id = 0
+
+    def _add(self, row: dict) -> None:
+        row_id = row["id"]
+        if row_id in self._rows:
+            self._remove(row_id)
+        norm = {f: _normalize_search_text(row.get(f)) for f in self.fields}
+        self._rows[row_id] = row
+        self._norm[row_id] = norm
+        for f, text in norm.items():
+            postings = self._postings[f]
+            for gram in _ngrams(text):
+                postings.setdefault(gram, set()).add(row_id)
+        if isinstance(row_id, int) and row_id > self._max_id:
+            self._max_id = row_id
+
+    def _remove(self, row_id) -> None:
+        norm = self._norm.pop(row_id, None)
+        self._rows.pop(row_id, None)
+        if norm is None:
+            return
+        for f, text in norm.items():
+            postings = self._postings[f]
+            for gram in _ngrams(text):
+                ids = postings.get(gram)
+                if ids is not None:
+                    ids.discard(row_id)
+                    if not ids:
+                        del postings[gram]
+
+    def upsert(self, rows) -> None:
+        with self._lock:
+            if self.loaded_at is None:
+                return  # 아직 적재 전이면 첫 적재 때 함께 들어온다
+            for row in rows:
+                self._add(row)
+
+    def remove(self, ids) -> None:
+        with self._lock:
+            for row_id in ids:
+                self._remove(row_id)
+
+    def full_load(self) -> None:
+        with _read_conn(self.table) as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT * FROM {self.table}" + (f" WHERE {self.where}" if self.where else ""))
+                rows = cur.fetchall()
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self._add(row)
+            self.loaded_at = self.refreshed_at = time.monotonic()
+
+    def refresh_incremental(self) -> int:
+        """하이워터마크(id) 이후에 추가된 행만 가져와 반영"""
+        with self._lock:
+            max_id = self._max_id
+        with _read_conn(self.table) as conn:
+            with conn.cursor() as cur:
+                where = f" AND {self.where}" if self.where else ""
+                cur.execute(f"SELECT * FROM {self.table} WHERE id > %s{where} ORDER BY id ASC", (max_id,))
+                rows = cur.fetchall()
+        with self._lock:
+            for row in rows:
+                self._add(row)
+            self.refreshed_at = time.monotonic()
+        return len(rows)
+
+    def ensure_loaded(self) -> None:
+        if self.loaded_at is None:
+            with self._load_lock:
+                if self.loaded_at is None:
+                    self.full_load()
+
+    def _match_ids(self, field: str, query: str) -> set:
+        q = _normalize_search_text(query)
+        grams = _ngrams(q)
+        if not grams:  # n보다 짧은 질의는 전체 후보에서 확인
+            candidates = self._rows.keys()
+        else:
+            postings = self._postings[field]
+            sets = sorted((postings.get(g, set()) for g in grams), key=len)
+            candidates = set.intersection(*sets) if sets[0] else set()
+        return {i for i in candidates if q in self._norm[i][field]}
+
+    def search(self, terms: dict[str, str], where=None, order_key=None,
+               after: Optional[tuple] = None, limit: Optional[int] = None,
+               extra_rows=None) -> tuple[list[dict], Optional[tuple]]:
+        """
+        terms의 모든 (field, keyword)를 띄어쓰기 무시 부분 문자열로 만족하는 행을 점수순으로 반환.
+        점수: 원문 띄어쓰기까지 일치하면 가산 + 키워드가 필드에서 차지하는 비율 (짧고 정확한 매치 우선).
+        정렬 키 (-점수, order_key, id) 기준 keyset 페이지네이션: after 다음부터 limit개와 다음 페이지 키를 반환.
+        extra_rows: 색인하지 않은 행 (예: 사용자별 personal 일정) - 같은 조건으로 직접 걸러 함께 정렬한다.
+        """
+        self.ensure_loaded()
+        with self._lock:
+            ids = None
+            for field, query in terms.items():
+                matched = self._match_ids(field, query)
+                ids = matched if ids is None else ids & matched
+            rows = [self._rows[i] for i in (self._rows if ids is None else ids)]
+        if extra_rows:
+            queries = {f: _normalize_search_text(q) for f, q in terms.items()}
+            rows += [r for r in extra_rows if r["id"] not in self._rows
+                     and all(q in _normalize_search_text(r.get(f)) for f, q in queries.items())]
+        if where is not None:
+            rows = [r for r in rows if where(r)]
+
+        def score(row) -> float:
+            total = 0.0
+            for field, query in terms.items():
+                text = str(row.get(field) or "")
+                q = _normalize_search_text(query)
+                total += 1.0 if query.strip().lower() in text.lower() else 0.0
+                total += len(q) / max(len(_normalize_search_text(text)), 1)
+            return total
+
+        order = order_key or (lambda r: "")
+        keyed = sorted(((-score(r), str(order(r)), r["id"]), r) for r in rows)
+        keys = [k for k, _ in keyed]
+        start = bisect.bisect_right(keys, after) if after is not None else 0
+        end = start + limit if limit is not None else len(keyed)
+        page = [r for _, r in keyed[start:end]]
+        next_key = keys[end - 1] if end < len(keyed) and page else None
+        return page, next_key
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rows": len(self._rows),
+                "grams": sum(len(p) for p in self._postings.values()),
+                "max_id": self._max_id,
+                "loaded": self.loaded_at is not None,
+            }
+
+
+_SEARCH_INDEXES = {
+    "smu_notices": SearchIndex("smu_notices", ("title",)),
+    "smu_meals": SearchIndex("smu_meals", ("meal",)),
+    "smu_exam": SearchIndex("smu_exam", ("subject_name", "professor")),
+    # personal 일정은 다른 프로세스의 수정/삭제가 바로 보여야 하므로 색인하지 않고 사용자별로 읽는다
+    "smu_schedule": SearchIndex("smu_schedule", ("content",), where="type = 'common'"),
+}
+_SEARCH_REFRESHER: Optional[threading.Thread] = None
+_SEARCH_REFRESHER_LOCK = threading.Lock()
+
+
+def _search_refresh_loop() -> None:
+    config = get_search_index_config()
+    _CURRENT_TOOL.set("background:search_index")
+    while True:
+        time.sleep(config["refresh_interval"])
+        for index in _SEARCH_INDEXES.values():
+            if index.loaded_at is None:
+                continue
+            try:
+                if time.monotonic() - index.loaded_at >= config["full_refresh_interval"]:
+                    index.full_load()
+                else:
+                    index.refresh_incremental()
+            except Exception as e:
+                logger.warning("search index refresh of %s failed: %s", index.table, e)
+
+
+def get_search_index(table: str) -> SearchIndex:
+    """테이블별 검색 인덱스 (첫 사용 시 백그라운드 갱신 스레드 시작)"""
+    global _SEARCH_REFRESHER
+    if _SEARCH_REFRESHER is None:
+        with _SEARCH_REFRESHER_LOCK:
+            if _SEARCH_REFRESHER is None:
+                _SEARCH_REFRESHER = threading.Thread(
+                    target=_search_refresh_loop, name="smus-search-refresh", daemon=True
+                )
+                _SEARCH_REFRESHER.start()
+    return _SEARCH_INDEXES[table]
+
+
+def _schedule_visible(row: dict, user_id: Optional[str]) -> bool:
+    """'common'은 모두에게, 'personal'은 user_id가 일치할 때만"""
+    if row.get("type") == "common":
+        return True
+    return bool(user_id) and row.get("type") == "personal" and str(row.get("user_id")) == str(user_id)
+
+
+MEAL_CATEGORIES = ("breakfast", "lunch", "dinner")
+MAX_MEAL_RANGE_DAYS = 62
+# smu_meals.date가 텍스트로 저장된 경우 섞여 있는 표기들
+_MEAL_DATE_TEXT_FORMATS = ("%Y.%m.%d", "%Y/%m/%d")
+
+
+def _normalize_meal_date(value) -> Optional[str]:
+    """smu_meals.date 값(DATE/DATETIME/여러 표기의 문자열)을 'YYYY-MM-DD'로 정규화"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if value is None:
+        return None
+    s = str(value).strip()
+    for fmt in ("%Y-%m-%d", *_MEAL_DATE_TEXT_FORMATS):
+        try:
+            return datetime.strptime(s[:10], fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def _meals_range_sql(start: date, end: date, cats: list[str]) -> tuple[str, tuple]:
+    """
+    [start, end] 기간 식단 조회 SQL.
+    스키마 부트스트랩이 정규화 컬럼(meal_date DATE, category_norm)을 확인했으면 그 컬럼으로 바로 range scan,
+    아니면 원본 `date`/`category`에 ISO 범위 + 텍스트 표기 IN 목록을 함께 건다.
+    """
+    category_col = "category_norm" if _SCHEMA_STATE["columns"].get("smu_meals.category_norm") else "category"
+    category_sql = f"{category_col} IN ({', '.join(['%s'] * len(cats))})"
+    next_day = (end + timedelta(days=1)).isoformat()
+    if _SCHEMA_STATE["columns"].get("smu_meals.meal_date"):
+        sql = f"""
+            SELECT *
+            FROM smu_meals
+            WHERE {category_sql}
+              AND meal_date >= %s AND meal_date < %s
+            ORDER BY meal_date ASC
+        """
+        return sql, (*cats, start.isoformat(), next_day)
+
+    days = (end - start).days + 1
+    text_variants = [
+        (start + timedelta(days=i)).strftime(fmt) for i in range(days) for fmt in _MEAL_DATE_TEXT_FORMATS
+    ]
+    sql = f"""
+        SELECT *
+        FROM smu_meals
+        WHERE {category_sql}
+          AND (
+                (`date` >= %s AND `date` < %s)
+             OR `date` IN ({", ".join(["%s"] * len(text_variants))})
+          )
+        ORDER BY `date` ASC
+    """
+    return sql, (*cats, start.isoformat(), next_day, *text_variants)
+
+
+@cached("smu_meals")
+def _query_meals_range(start_iso: str, end_iso: str, categories) -> dict[str, dict[str, list[dict]]]:
+    """
+    내부 헬퍼: [start_iso, end_iso] 기간의 식단을 한 번의 쿼리로 조회해 날짜 → 카테고리 → 레코드로 묶는다.
+    - 컬럼에 함수를 씌우지 않아 `date`/`category` 인덱스를 그대로 탈 수 있음
+      * DATE/DATETIME 또는 ISO 문자열: `date` >= 시작 AND `date` < 끝+1일 (range scan)
+      * 'YYYY.MM.DD', 'YYYY/MM/DD' 문자열: 기간 내 날짜들을 해당 표기로 펼친 IN 목록
+    - category는 IN 비교 (MySQL 기본 collation이 대소문자 무시이므로 LOWER() 불필요)
+    - 요청 범위의 모든 날짜/카테고리 키를 채워 반환 (식단이 없으면 빈 리스트)
+    """
+    start = _coerce_to_kst(start_iso).date()
+    end = _coerce_to_kst(end_iso).date()
+    if end < start:
+        raise ValueError("end_date must be equal to or later than start_date.")
+    days = (end - start).days + 1
+    if days > MAX_MEAL_RANGE_DAYS:
+        raise ValueError(f"Date range too large: {days} days (max {MAX_MEAL_RANGE_DAYS}).")
+
+    cats = [c.strip().lower() for c in categories if c and c.strip()] or list(MEAL_CATEGORIES)
+    cats = list(dict.fromkeys(cats))
+    all_days = [start + timedelta(days=i) for i in range(days)]
+
+    sql, params = _meals_range_sql(start, end, cats)
+    with _read_conn("smu_meals") as conn:
         with conn.cursor() as cur:
-            # DATE 타입이면 DATE(`date`) = %s 로 맞음
-            # 문자열일 가능성도 있어 COALESCE(STR_TO_DATE(...)) 로 보조
-            sql = """
-                SELECT *
-                FROM smu_meals
-                WHERE LOWER(category) = LOWER(%s)
-                  AND (
-                        DATE(`date`) = %s
-                     OR COALESCE(
-                            STR_TO_DATE(`date`, '%%Y-%%m-%%d'),
-                            STR_TO_DATE(`date`, '%%Y.%%m.%%d'),
-                            STR_TO_DATE(`date`, '%%Y/%%m/%%d')
-                        ) = %s
-                  )
-                ORDER BY `date` ASC
-            """
-            cur.execute(sql, (category, date_iso, date_iso))
+            cur.execute(sql, params)
             rows = cur.fetchall()
-            return rows
-    finally:
-        conn.close()
+
+    grouped = {d.isoformat(): {c: [] for c in cats} for d in all_days}
+    for row in rows:
+        day = grouped.get(_normalize_meal_date(row.get("date")))
+        category = str(row.get("category") or "").lower()
+        if day is not None and category in day:
+            day[category].append(row)
+    return grouped
+
+
+def _query_meals_by_date_category(date_iso: str, category: str) -> list[dict]:
+    """
+    내부 헬퍼: YYYY-MM-DD(iso) 날짜와 카테고리(breakfast/lunch/dinner)로 smu_meals 조회
+    - 기간 조회(_query_meals_range)의 하루짜리 특수 경우
+    """
+    day = _coerce_to_kst(date_iso).date().isoformat()
+    category = (category or "").strip().lower()
+    if not category:
+        return []  # 빈 카테고리는 기간 조회에서 '전체'로 바뀌므로 여기서 먼저 걸러 낸다
+    return _query_meals_range(day, day, [category])[day][category]
 
 # FastMCP 서버 (HTTP/STDIO 겸용)
 mcp = FastMCP(name="smus")
@@ -67,17 +1271,6 @@ mcp = FastMCP(name="smus")
 
 KST = ZoneInfo("Asia/Seoul")
 
-def _get_conn():
-    host = os.getenv("DB_HOST")
-    user = os.getenv("DB_USER")
-    password = os.getenv("DB_PASSWORD")
-    database = os.getenv("DB_NAME")
-    port = int(os.getenv("DB_PORT", "3306"))
-    if not all([host, user, password, database]):
-        raise RuntimeError("DB env vars not set: DB_HOST/DB_USER/DB_PASSWORD/DB_NAME")
-    return pymysql.connect(host=host, user=user, password=password,
-                           database=database, port=port, autocommit=True)
-
 def _coerce_to_kst(dt_str: str) -> datetime:
     """
     문자열을 KST datetime으로 엄격 변환.
@@ -108,9 +1301,540 @@ def _coerce_to_kst(dt_str: str) -> datetime:
     raise ValueError(f"Invalid datetime format: {dt_str}. Use 'YYYY-MM-DD' or ISO-like strings.")
 
 
+# ---- 자연어 날짜 해석 ----
+# '2025-10-21', '10월 21일', '다음 주', '이번 달', '다음 주 화요일', '3일 후' 같은 표현을
+# KST 반열린 구간 [start, end)로 바꾼다. 일정 조회는 이 구간과 겹치는 일정을 찾는다.
+_WEEKDAYS = {
+    "월요일": 0, "화요일": 1, "수요일": 2, "목요일": 3, "금요일": 4, "토요일": 5, "일요일": 6,
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3, "friday": 4, "saturday": 5, "sunday": 6,
+}
+_DAY_WORDS = {
+    "오늘": 0, "today": 0, "내일": 1, "tomorrow": 1, "모레": 2, "내일모레": 2, "글피": 3,
+    "어제": -1, "yesterday": -1, "그제": -2, "그저께": -2,
+}
+_WEEK_WORDS = {
+    "이번주": 0, "금주": 0, "thisweek": 0, "다음주": 1, "차주": 1, "nextweek": 1,
+    "지난주": -1, "저번주": -1, "lastweek": -1, "다다음주": 2,
+}
+_MONTH_WORDS = {
+    "이번달": 0, "thismonth": 0, "다음달": 1, "nextmonth": 1, "지난달": -1, "저번달": -1, "lastmonth": -1,
+}
 
-    
-@mcp.tool()
+
+def _day_start(d: date) -> datetime:
+    return datetime(d.year, d.month, d.day, tzinfo=KST)
+
+
+def _month_interval(year: int, month: int) -> tuple[datetime, datetime]:
+    start = datetime(year, month, 1, tzinfo=KST)
+    end = datetime(year + (month == 12), month % 12 + 1, 1, tzinfo=KST)
+    return start, end
+
+
+def _parse_date_phrase(phrase: str, now: Optional[datetime] = None) -> tuple[datetime, datetime]:
+    """
+    날짜 표현을 KST 반열린 구간 [start, end)로 변환.
+    허용 예: '2025-10-21', '2025.10.21', '10-21', '10/21', '10월 21일', '2025년 10월', '10월', '2025-10',
+            '오늘', '내일', '어제', '이번 주', '다음 주', '지난 주', '이번 달', '다음 달',
+            '화요일', '다음 주 화요일', '3일 후', '2일 전'
+    """
+    now = (now or datetime.now(KST)).astimezone(KST)
+    today = now.date()
+    s = "".join(phrase.split()).lower()
+    if not s:
+        raise ValueError("Empty date phrase.")
+
+    if s in _DAY_WORDS:
+        d = today + timedelta(days=_DAY_WORDS[s])
+        return _day_start(d), _day_start(d + timedelta(days=1))
+
+    m = re.fullmatch(r"(\d+)일(후|뒤|전)", s)
+    if m:
+        n = int(m.group(1)) * (-1 if m.group(2) == "전" else 1)
+        d = today + timedelta(days=n)
+        return _day_start(d), _day_start(d + timedelta(days=1))
+
+    week_offset = None
+    for word, offset in sorted(_WEEK_WORDS.items(), key=lambda kv: -len(kv[0])):
+        if s.startswith(word):
+            week_offset, s = offset, s[len(word):]
+            break
+    if s in _WEEKDAYS or (s + "요일") in _WEEKDAYS:
+        monday = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset or 0)
+        d = monday + timedelta(days=_WEEKDAYS.get(s, _WEEKDAYS.get(s + "요일")))
+        return _day_start(d), _day_start(d + timedelta(days=1))
+    if week_offset is not None:
+        if s:
+            raise ValueError(f"Unrecognized date phrase: {phrase}")
+        monday = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
+        return _day_start(monday), _day_start(monday + timedelta(days=7))
+
+    if s in _MONTH_WORDS:
+        index = today.year * 12 + today.month - 1 + _MONTH_WORDS[s]
+        return _month_interval(index // 12, index % 12 + 1)
+
+    # 연/월/일 숫자 표현
+    m = (
+        re.fullmatch(r"(?:(\d{4})년)?(\d{1,2})월(?:(\d{1,2})일)?", s)
+        or re.fullmatch(r"(?:(\d{4})[-./])?(\d{1,2})[-./](\d{1,2})", s)
+        or re.fullmatch(r"(\d{4})[-./](\d{1,2})()", s)
+    )
+    if m:
+        year = int(m.group(1)) if m.group(1) else today.year
+        month = int(m.group(2))
+        if m.group(3):
+            d = date(year, month, int(m.group(3)))
+            return _day_start(d), _day_start(d + timedelta(days=1))
+        return _month_interval(year, month)
+
+    # 그 밖의 ISO-like 값 ('2025-10-21T13:30' 등)은 해당 날짜 하루
+    try:
+        d = _coerce_to_kst(phrase).date()
+    except ValueError:
+        raise ValueError(
+            f"Unrecognized date phrase: {phrase}. Use e.g. '2025-10-21', '10월 21일', '다음 주', '이번 달'."
+        ) from None
+    return _day_start(d), _day_start(d + timedelta(days=1))
+
+
+def _resolve_date_interval(
+    date_keyword: Optional[str], date_from: Optional[str], date_to: Optional[str]
+) -> tuple[datetime, datetime]:
+    """date_keyword 또는 date_from/date_to(달력 보기용 범위, 양 끝 포함)를 하나의 구간으로"""
+    if date_from or date_to:
+        start, _ = _parse_date_phrase(date_from or date_to)
+        _, end = _parse_date_phrase(date_to or date_from)
+    elif date_keyword:
+        start, end = _parse_date_phrase(date_keyword)
+    else:
+        raise ValueError("Provide date_keyword or date_from/date_to.")
+    if end <= start:
+        raise ValueError("date_to must be equal to or later than date_from.")
+    return start, end
+
+
+# ---- 메트릭 (Prometheus 텍스트 형식) ----
+# 툴 호출 지연/행 수/응답 크기/오류, DB 연결·쿼리 시간을 모아 /metrics 로 노출한다.
+# SLOW_QUERY_MS를 넘긴 쿼리는 SQL과 파라미터를 경고 로그로 남긴다.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROW_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))  # 0이면 슬로우 쿼리 로그 끔
+
+_CURRENT_TOOL: contextvars.ContextVar[str] = contextvars.ContextVar("smus_current_tool", default="-")
+
+
+class Metrics:
+    """의존성 없는 최소한의 카운터/히스토그램 레지스트리"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: dict[str, tuple[str, str]] = {}  # name -> (type, help)
+        self._counters: dict[tuple, float] = {}
+        self._histograms: dict[tuple, list] = {}  # (name, labels) -> [bucket counts..., sum, count]
+        self._buckets: dict[str, tuple] = {}
+
+    def counter(self, name: str, help_text: str) -> None:
+        self._help[name] = ("counter", help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: tuple) -> None:
+        self._help[name] = ("histogram", help_text)
+        self._buckets[name] = buckets
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        buckets = self._buckets[name]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            h = self._histograms.get(key)
+            if h is None:
+                h = self._histograms[key] = [0] * len(buckets) + [0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    h[i] += 1
+            h[-2] += value
+            h[-1] += 1
+
+    @staticmethod
+    def _labels(labels, extra: str = "") -> str:
+        parts = [f'{k}="{str(v)}"' for k, v in labels]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def render(self, gauges: dict[str, tuple[str, dict]] = None) -> str:
+        """Prometheus 텍스트 노출 형식. gauges: { name: (help, { labels_tuple: value }) }"""
+        lines = []
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+        for name, (kind, help_text) in sorted(self._help.items()):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            if kind == "counter":
+                for (n, labels), value in sorted(counters.items()):
+                    if n == name:
+                        lines.append(f"{name}{self._labels(labels)} {value}")
+                continue
+            buckets = self._buckets[name]
+            for (n, labels), h in sorted(histograms.items()):
+                if n != name:
+                    continue
+                for bound, count in zip(buckets, h):
+                    le = 'le="%s"' % bound
+                    lines.append(f"{name}_bucket{self._labels(labels, le)} {count}")
+                le = 'le="+Inf"'
+                lines.append(f"{name}_bucket{self._labels(labels, le)} {h[-1]}")
+                lines.append(f"{name}_sum{self._labels(labels)} {h[-2]}")
+                lines.append(f"{name}_count{self._labels(labels)} {h[-1]}")
+        for name, (help_text, values) in sorted((gauges or {}).items()):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for labels, value in sorted(values.items()):
+                lines.append(f"{name}{self._labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+METRICS.counter("smus_tool_calls_total", "Tool calls by tool")
+METRICS.counter("smus_tool_errors_total", "Tool calls that raised, by tool and exception type")
+METRICS.histogram("smus_tool_latency_seconds", "End-to-end tool latency", LATENCY_BUCKETS)
+METRICS.histogram("smus_tool_rows", "Rows returned per tool call", ROW_BUCKETS)
+METRICS.histogram("smus_tool_response_bytes", "JSON-encoded response size per tool call (sampled)", BYTE_BUCKETS)
+METRICS.histogram("smus_db_connect_seconds", "Time to open a new DB connection", LATENCY_BUCKETS)
+METRICS.histogram("smus_db_acquire_seconds", "Time to borrow a pooled connection, by tool", LATENCY_BUCKETS)
+METRICS.histogram("smus_db_execute_seconds", "cursor.execute time (query + result transfer), by tool", LATENCY_BUCKETS)
+METRICS.histogram("smus_db_fetch_seconds", "cursor.fetch* time, by tool", LATENCY_BUCKETS)
+METRICS.counter("smus_db_queries_total", "Executed SQL statements, by tool")
+METRICS.counter("smus_db_slow_queries_total", "Queries slower than SLOW_QUERY_MS, by tool")
+METRICS.counter("smus_db_timeouts_total", "DB timeouts by tool and kind (pool wait, server MAX_EXECUTION_TIME, client socket)")
+METRICS.counter("smus_admission_rejected_total", "Tool calls rejected as busy, by tool class and reason")
+METRICS.counter("smus_singleflight_calls_total", "Cache-miss calls by helper; role=follower calls were merged into an in-flight query")
+
+
+class _InstrumentedCursor:
+    """execute/fetch 시간을 현재 툴 라벨로 기록하는 커서 프록시"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._cursor.__exit__(*exc)
+
+    def _timed_execute(self, method, sql, params):
+        tool = _CURRENT_TOOL.get()
+        t0 = time.perf_counter()
+        try:
+            return method(sql, params)
+        except pymysql.err.MySQLError as e:
+            kind = _timeout_kind(e)
+            if kind:
+                METRICS.inc("smus_db_timeouts_total", tool=tool, kind=kind)
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            METRICS.inc("smus_db_queries_total", tool=tool)
+            METRICS.observe("smus_db_execute_seconds", elapsed, tool=tool)
+            if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+                METRICS.inc("smus_db_slow_queries_total", tool=tool)
+                logger.warning(
+                    "slow query %.1f ms [tool=%s]: %s params=%r",
+                    elapsed * 1000, tool, " ".join(sql.split()), params,
+                )
+
+    def execute(self, sql, params=None):
+        return self._timed_execute(self._cursor.execute, sql, params)
+
+    def executemany(self, sql, params):
+        return self._timed_execute(self._cursor.executemany, sql, params)
+
+    def _timed_fetch(self, method, *args):
+        t0 = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            METRICS.observe("smus_db_fetch_seconds", time.perf_counter() - t0, tool=_CURRENT_TOOL.get())
+
+    def fetchall(self):
+        return self._timed_fetch(self._cursor.fetchall)
+
+    def fetchone(self):
+        return self._timed_fetch(self._cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        return self._timed_fetch(self._cursor.fetchmany, size)
+
+
+class _InstrumentedConnection:
+    """cursor()가 계측 커서를 돌려주는 커넥션 프록시 (나머지는 원본에 위임)"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return _InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+
+# 응답 바이트 수는 JSON을 한 번 더 인코딩해야 알 수 있으므로 N번에 한 번만 잰다 (0이면 끔)
+RESPONSE_BYTES_SAMPLE_EVERY = int(os.getenv("RESPONSE_BYTES_SAMPLE_EVERY", "20"))
+_RESPONSE_BYTES_COUNTER = itertools.count()
+
+
+def _result_stats(result) -> tuple[int, Optional[int]]:
+    """툴 결과의 (행 수, JSON 바이트 수; 샘플링에서 빠진 호출은 None)"""
+    if isinstance(result, dict) and isinstance(result.get("items"), list):
+        rows = len(result["items"])
+    elif isinstance(result, dict) and isinstance(result.get("rows"), list):
+        rows = len(result["rows"])
+    elif isinstance(result, (list, tuple)):
+        rows = len(result)
+    elif isinstance(result, dict) and result and all(isinstance(v, dict) for v in result.values()):
+        rows = sum(len(x) for v in result.values() for x in v.values() if isinstance(x, list))
+    else:
+        rows = 1
+    size = None
+    if RESPONSE_BYTES_SAMPLE_EVERY > 0 and next(_RESPONSE_BYTES_COUNTER) % RESPONSE_BYTES_SAMPLE_EVERY == 0:
+        size = len(json.dumps(result, ensure_ascii=False, default=str).encode("utf-8"))
+    return rows, size
+
+
+def _record_tool_call(name: str, started: float, result=None, error: Optional[BaseException] = None) -> None:
+    METRICS.inc("smus_tool_calls_total", tool=name)
+    METRICS.observe("smus_tool_latency_seconds", time.perf_counter() - started, tool=name)
+    if error is not None:
+        METRICS.inc("smus_tool_errors_total", tool=name, error=type(error).__name__)
+        return
+    rows, size = _result_stats(result)
+    METRICS.observe("smus_tool_rows", rows, tool=name)
+    if size is not None:
+        METRICS.observe("smus_tool_response_bytes", size, tool=name)
+
+
+def local_tool():
+    """DB를 쓰지 않는 동기 툴을 계측해서 MCP 툴로 등록하는 데코레이터"""
+    def decorator(fn):
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                _record_tool_call(name, started, error=e)
+                raise
+            _record_tool_call(name, started, result)
+            return result
+
+        mcp.tool()(wrapper)
+        return wrapper
+
+    return decorator
+
+
+def _collect_gauges() -> dict:
+    pool = get_pool().stats() if _POOL is not None else {}
+    gauges = {
+        "smus_db_pool": ("Connection pool state and wait statistics",
+                         {(("stat", k),): v for k, v in pool.items()}),
+        "smus_cache": ("Result cache counters", {(("stat", k),): v for k, v in _RESULT_CACHE.stats().items()}),
+        "smus_singleflight_in_flight": ("Distinct queries currently in flight", {(): _SINGLE_FLIGHT.in_flight()}),
+        "smus_schema_full_scan": ("1 if the tool query still scans a full table (SCHEMA_BOOTSTRAP check)",
+                                  {(("query", q),): int(bool(t)) for q, t in _SCHEMA_STATE["full_scans"].items()}),
+        "smus_import_seconds": ("Time to import the server module, including dependencies", {(): round(IMPORT_SECONDS, 4)}),
+        "smus_ready": ("1 once startup warm-up finished and the DB (or snapshot) can serve reads",
+                       {(): int(_READINESS["ready"])}),
+        "smus_schedule_view": ("Per-user schedule view state",
+                               {(("stat", k),): v for k, v in _SCHEDULE_VIEW.stats().items()} if _SCHEDULE_VIEW else {}),
+        "smus_admission": ("Admission control state by tool class",
+                           {(("kind", k), ("stat", st)): v for k, a in _ADMISSION.items() for st, v in a.stats().items()}),
+        "smus_search_index_rows": ("Rows held by each search index",
+                                   {(("table", t),): i.stats()["rows"] for t, i in _SEARCH_INDEXES.items()}),
+    }
+    if _SNAPSHOT is not None:
+        status = _SNAPSHOT.status()
+        gauges["smus_snapshot_lag_seconds"] = (
+            "Seconds since each snapshot table was last synced",
+            {(("table", t),): st["lag_seconds"] for t, st in status.items() if st["lag_seconds"] is not None},
+        )
+    return gauges
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus 스크레이프 엔드포인트"""
+    return PlainTextResponse(METRICS.render(_collect_gauges()), media_type="text/plain; version=0.0.4")
+
+
+# ---- 비동기 실행 (DB 툴 오프로딩) ----
+# pymysql은 블로킹 드라이버이므로 DB 툴은 전용 스레드 풀에서 실행한다.
+# 이벤트 루프는 막히지 않고, 툴별 세마포어로 한 툴이 풀을 독점하지 못하게 제한한다.
+def get_admission_config():
+    """
+    입장 제어 설정을 환경변수에서 읽어오는 함수 (기본값은 풀 크기 기준)
+    쓰기 슬롯을 풀에서 먼저 떼어 두고 나머지를 읽기 슬롯으로 써서, 읽기가 몰려도 쓰기가 커넥션/스레드를 기다리지 않게 한다
+    """
+    pool_max = get_pool_config()["maxsize"]
+    write_slots = int(os.getenv("ADMIT_WRITE_CONCURRENCY", str(max(1, pool_max // 4))))
+    read_slots = int(os.getenv("ADMIT_READ_CONCURRENCY", str(max(1, pool_max - write_slots))))
+    return {
+        "read": {"slots": read_slots, "queue": int(os.getenv("ADMIT_READ_QUEUE", str(read_slots * 4)))},
+        "write": {"slots": write_slots, "queue": int(os.getenv("ADMIT_WRITE_QUEUE", str(write_slots * 4)))},
+        "queue_timeout": float(os.getenv("ADMIT_QUEUE_TIMEOUT", "5")),
+    }
+
+
+def get_offload_config():
+    """DB 툴 오프로딩 설정을 환경변수에서 읽어오는 함수 (스레드 수 기본값 = 읽기 + 쓰기 슬롯)"""
+    pool_max = get_pool_config()["maxsize"]
+    admission = get_admission_config()
+    slots = admission["read"]["slots"] + admission["write"]["slots"]
+    if slots > pool_max:
+        logger.warning(
+            "ADMIT_READ_CONCURRENCY + ADMIT_WRITE_CONCURRENCY (%d) exceeds the pool size (%d); "
+            "admitted writes may wait for reads to release a connection", slots, pool_max,
+        )
+    return {
+        "threads": int(os.getenv("DB_THREADS", str(slots))),
+        "tool_concurrency": int(os.getenv("TOOL_CONCURRENCY", str(pool_max))),
+    }
+
+
+_OFFLOAD_CONFIG = get_offload_config()
+_DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=_OFFLOAD_CONFIG["threads"], thread_name_prefix="smus-db"
+)
+_TOOL_SEMAPHORES: dict[str, asyncio.Semaphore] = {}
+
+
+def _tool_semaphore(name: str, limit: Optional[int]) -> asyncio.Semaphore:
+    sem = _TOOL_SEMAPHORES.get(name)
+    if sem is None:
+        env_limit = os.getenv(f"TOOL_CONCURRENCY_{name.upper()}")
+        if env_limit:
+            limit = int(env_limit)
+        sem = _TOOL_SEMAPHORES[name] = asyncio.Semaphore(
+            limit or _OFFLOAD_CONFIG["tool_concurrency"]
+        )
+    return sem
+
+
+# ---- 입장 제어 (읽기 / 쓰기 클래스별 동시 실행 + 대기열 상한) ----
+# RDS가 느려지면 요청이 끝없이 쌓여 꼬리 지연이 폭발하므로, 클래스별로 실행 슬롯과 대기열 길이를 제한하고
+# 넘치면 대기 없이 바로 ServerBusyError로 거절한다. 쓰기 툴(add_/delete_)은 읽기 폭주에 밀리지 않도록 따로 센다.
+class ServerBusyError(RuntimeError):
+    """입장 제어에서 거절됐을 때 발생 (잠시 후 재시도하면 되는 오류)"""
+
+
+class Admission:
+    """실행 슬롯 slots개 + 대기열 queue개. 대기열이 차 있거나 queue_timeout 안에 슬롯을 못 얻으면 거절"""
+
+    def __init__(self, kind: str, slots: int, queue: int, queue_timeout: float):
+        self.kind = kind
+        self.slots = slots
+        self.queue = queue
+        self.queue_timeout = queue_timeout
+        self._sem = asyncio.Semaphore(slots)
+        self.active = 0
+        self.waiting = 0
+
+    def _reject(self, reason: str, detail: str):
+        METRICS.inc("smus_admission_rejected_total", kind=self.kind, reason=reason)
+        return ServerBusyError(f"Server busy ({self.kind} {detail}); please retry shortly.")
+
+    @asynccontextmanager
+    async def admit(self):
+        if not self._sem.locked():
+            await self._sem.acquire()  # 빈 슬롯이 있으면 양보 없이 바로 획득
+        elif self.waiting >= self.queue:
+            raise self._reject("queue_full", f"queue full: {self.waiting} waiting")
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._sem.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject("queue_timeout", f"no slot within {self.queue_timeout:.1f}s") from None
+            finally:
+                self.waiting -= 1
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._sem.release()
+
+    def stats(self) -> dict:
+        return {"active": self.active, "waiting": self.waiting, "slots": self.slots, "queue": self.queue}
+
+
+_ADMISSION_CONFIG = get_admission_config()
+_ADMISSION = {
+    kind: Admission(kind, _ADMISSION_CONFIG[kind]["slots"], _ADMISSION_CONFIG[kind]["queue"],
+                    _ADMISSION_CONFIG["queue_timeout"])
+    for kind in ("read", "write")
+}
+
+
+def _tool_kind(name: str) -> str:
+    return "write" if name.startswith(("add_", "delete_")) else "read"
+
+
+async def _run_blocking(fn, *args, **kwargs):
+    """블로킹 함수를 DB 스레드 풀에서 실행 (contextvars 유지)"""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _DB_EXECUTOR, functools.partial(ctx.run, fn, *args, **kwargs)
+    )
+
+
+def db_tool(limit: Optional[int] = None):
+    """
+    동기 DB 함수를 비동기 MCP 툴로 등록하는 데코레이터.
+    - 시그니처/docstring/반환 JSON은 원래 함수 그대로 (FastMCP는 __wrapped__의 시그니처를 사용)
+    - limit: 이 툴의 동시 실행 상한 (기본 TOOL_CONCURRENCY, 환경변수 TOOL_CONCURRENCY_<TOOL명>으로 덮어쓰기)
+    - 동기 구현은 `툴.__wrapped__`로 호출 가능
+    - 호출마다 지연/행 수/응답 크기/오류와 툴별 DB 시간을 METRICS에 기록
+    - 읽기/쓰기(add_/delete_) 클래스별 입장 제어를 먼저 통과해야 하며, 넘치면 ServerBusyError
+    """
+    def decorator(fn):
+        name = fn.__name__
+        admission = _ADMISSION[_tool_kind(name)]
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            token = _CURRENT_TOOL.set(name)
+            try:
+                async with admission.admit(), _tool_semaphore(name, limit):
+                    result = await _run_blocking(fn, *args, **kwargs)
+            except Exception as e:
+                _record_tool_call(name, started, error=e)
+                raise
+            finally:
+                _CURRENT_TOOL.reset(token)
+            _record_tool_call(name, started, result)
+            return result
+
+        mcp.tool()(wrapper)
+        return wrapper
+
+    return decorator
+
+
+@local_tool()
 def now_kr() -> dict:
     """Return current date/time info in Asia/Seoul (KST, UTC+9)."""
     tz = ZoneInfo("Asia/Seoul")
@@ -123,208 +1847,630 @@ def now_kr() -> dict:
         "tz": "Asia/Seoul (KST, UTC+9)",
     }
 
-@mcp.tool()
-def query_smu_meals_by_date_category(date_iso: str, category: str = "lunch") -> dict:
+@db_tool()
+def query_smu_meals_by_date_category(
+    date_iso: str,
+    category: str = "lunch",
+    format: Optional[str] = None,
+) -> dict:
     """
     YYYY-MM-DD 날짜와 카테고리로 smu_meals를 조회한다.
     Args:
         date_iso: '2025-08-27' 같은 ISO 날짜 문자열
         category: 'breakfast' | 'lunch' | 'dinner'
+        format: 'rows'(기본) | 'columnar'(columns 한 번 + rows 값 배열)
     Returns:
-        dict: 레코드 리스트
+        dict: 레코드 리스트 (columnar면 기간 조회와 같은 { columns, rows, count })
     """
     rows = _query_meals_by_date_category(date_iso, category)
-    return rows  # 이미 list[dict]
+    if _resolve_format(format) == "columnar":
+        return {**encode_rows(rows, format="columnar"), "count": len(rows)}
+    return encode_rows(rows, format="rows")["items"]
+
+@db_tool()
+def query_smu_meals_by_date_range(
+    start_date: str,
+    end_date: Optional[str] = None,
+    categories: Optional[list[str]] = None,
+    format: Optional[str] = None,
+) -> dict:
+    """
+    기간(시작~끝 날짜)과 카테고리 목록으로 smu_meals를 한 번에 조회한다. ("이번 주 식단" 등)
+    Args:
+        start_date: '2025-10-20' 같은 ISO 날짜 문자열
+        end_date: 끝 날짜(포함). 생략하면 start_date 하루만 조회. 최대 62일.
+        categories: ['breakfast', 'lunch', 'dinner'] 중 일부. 생략하면 전부.
+        format: 'rows'(기본) | 'columnar'(날짜·카테고리 순으로 펼친 columns 한 번 + rows 값 배열)
+    Returns:
+        dict: { 'YYYY-MM-DD': { category: [레코드, ...] } } (식단이 없으면 빈 리스트)
+              columnar면 { columns, rows, count }
+    """
+    grouped = _query_meals_range(start_date, end_date or start_date, categories or MEAL_CATEGORIES)
+    if _resolve_format(format) == "columnar":
+        rows = [row for by_cat in grouped.values() for cat_rows in by_cat.values() for row in cat_rows]
+        return {**encode_rows(rows, format="columnar"), "count": len(rows)}
+    return {
+        day: {cat: encode_rows(cat_rows, format="rows")["items"] for cat, cat_rows in by_cat.items()}
+        for day, by_cat in grouped.items()
+    }
+
+# (기존) 키워드 검색 도구가 필요하면 이 버전처럼 안전하게 수정
+@db_tool()
+@cached("smu_meals")
+def query_smu_meals_by_keyword(
+    keyword: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+    format: Optional[str] = None,
+) -> dict:
+    """
+    'meal' 텍스트 등에서 키워드 검색 (보조 용도)
+    - 띄어쓰기 무시 n-gram 인덱스에서 조회 (관련도 순)
+
+    Args:
+        keyword (str): 'meal' 컬럼에서 찾을 키워드.
+        limit (int, optional): 한 페이지 최대 행 수 (기본 50, 최대 200).
+        cursor (str, optional): 이전 응답의 next_cursor. 주면 그 다음 페이지를 반환.
+        fields (list[str], optional): 반환할 컬럼 목록. 생략하면 전체 컬럼.
+        format (str, optional): 'rows'(기본, 행마다 dict) | 'columnar'(columns 한 번 + rows 값 배열).
+
+    Returns:
+        dict: { items, count, next_cursor }
+    """
+    rows, next_key = get_search_index("smu_meals").search(
+        {"meal": keyword}, after=_decode_cursor(cursor, _SEARCH_CURSOR), limit=_clamp_limit(limit)
+    )
+    return _page(rows, next_key, fields, format)
+
+@db_tool()
+@cached("smu_notices")
+def query_smu_notices_by_keyword(
+    keyword: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+    format: Optional[str] = None,
+) -> dict:
+    """
+    'smu_notices' 테이블에서 'title' 컬럼에 특정 키워드를 포함하는 행을 조회하여 결과를 반환하는 도구.
+    
+    Args:
+        keyword (str): 'title' 컬럼에서 찾을 키워드.
+        limit (int, optional): 한 페이지 최대 행 수 (기본 50, 최대 200).
+        cursor (str, optional): 이전 응답의 next_cursor. 주면 그 다음 페이지를 반환.
+        fields (list[str], optional): 반환할 컬럼 목록. 생략하면 전체 컬럼.
+        format (str, optional): 'rows'(기본, 행마다 dict) | 'columnar'(columns 한 번 + rows 값 배열).
+        
+    Returns:
+        dict: { items, count, next_cursor } - items는 키워드가 포함된 'title' 컬럼을 가진 행들.
+    """
+
+    # 띄어쓰기 무시 n-gram 인덱스에서 조회 (관련도 순)
+    rows, next_key = get_search_index("smu_notices").search(
+        {"title": keyword}, after=_decode_cursor(cursor, _SEARCH_CURSOR), limit=_clamp_limit(limit)
+    )
+    return _page(rows, next_key, fields, format)
+    
+@db_tool()
+@cached("smu_exam")
+def query_smu_exam(
+    keyword: str,
+    professor: str | None = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+    format: Optional[str] = None,
+) -> dict:
+    """
+    smu_exam 테이블에서 subject_name, professor 조건을 조합해 검색.
+    - professor 인자가 주어지면 AND 조건으로 subject_name + professor 검색
+    - professor가 없으면 subject_name만 검색
+    - limit / cursor(next_cursor) / fields로 페이지 단위 조회
+    - format='columnar'면 columns 한 번 + rows 값 배열로 반환 (기본 'rows')
+    - 반환: { items, count, next_cursor }
+    - 띄어쓰기 무시 n-gram 인덱스에서 조회 (관련도 순, 동점이면 subject_name 순)
+    """
+    terms = {"subject_name": keyword}
+    if professor:
+        terms["professor"] = professor
+    rows, next_key = get_search_index("smu_exam").search(
+        terms,
+        where=lambda r: r.get("subject_name") is not None,
+        order_key=lambda r: r.get("subject_name"),
+        after=_decode_cursor(cursor, _SEARCH_CURSOR),
+        limit=_clamp_limit(limit),
+    )
+    return _page(rows, next_key, fields, format)
+        
+@db_tool()
+@cached("smu_schedule")
+def query_smu_schedule_by_keyword(
+    keyword: str,
+    user_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+    format: Optional[str] = None,
+) -> dict:
+    """
+    'smu_schedule' 테이블에서 'content' 컬럼에 특정 키워드를 포함하는 행을 조회하여 결과를 반환하는 도구.
+    type에 따라 필터링: 'common'은 모든 사용자에게, 'personal'은 해당 user_id에게만 제공.
+    
+    Args:
+        keyword (str): 'content' 컬럼에서 찾을 키워드.
+        user_id (str, optional): student ID (학번). 제공되면 해당 사용자의 개인 일정도 포함.
+        limit (int, optional): 한 페이지 최대 행 수 (기본 50, 최대 200).
+        cursor (str, optional): 이전 응답의 next_cursor. 주면 그 다음 페이지를 반환.
+        fields (list[str], optional): 반환할 컬럼 목록. 생략하면 전체 컬럼.
+        format (str, optional): 'rows'(기본, 행마다 dict) | 'columnar'(columns 한 번 + rows 값 배열).
+        
+    Returns:
+        dict: { items, count, next_cursor } - items는 키워드가 포함된 일정들 (type='common' + user_id가 일치하는 type='personal')
+    """
+    # common 일정은 띄어쓰기 무시 n-gram 인덱스에서, personal 일정은 해당 user_id 것만 읽어 함께 정렬
+    # (관련도 순, 동점이면 start_date 순)
+    rows, next_key = get_search_index("smu_schedule").search(
+        {"content": keyword},
+        where=lambda r: _schedule_visible(r, user_id),
+        extra_rows=_personal_schedules(str(user_id)) if user_id else None,
+        order_key=lambda r: r.get("start_date"),
+        after=_decode_cursor(cursor, _SEARCH_CURSOR),
+        limit=_clamp_limit(limit),
+    )
+    return _page(rows, next_key, fields, format)
+
+def _personal_schedules(user_id: str) -> list[dict]:
+    """한 사용자의 personal 일정 전체 (일정 뷰가 켜져 있으면 뷰에서, 아니면 DB(결과 캐시)에서)"""
+    view = get_schedule_view()
+    if view is not None:
+        return view.personal_rows(user_id)
+    return _query_personal_schedules(user_id)
+
+
+@cached("smu_schedule")
+def _query_personal_schedules(user_id: str) -> list[dict]:
+    with _db_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT * FROM smu_schedule WHERE type = 'personal' AND user_id = %s", (user_id,))
+            return list(cur.fetchall())
+
+
+def _schedule_branch_sql(where: str, keyset: str = "") -> str:
+    """구간 겹침 조회의 한 가지 (common 또는 personal). 파라미터: [where 값...], end, start, [keyset...], limit"""
+    return f"""
+        SELECT id, start_date, end_date, content, type, user_id, created_at
+        FROM smu_schedule
+        WHERE {where}
+          AND start_date < %s
+          AND COALESCE(end_date, start_date) >= %s
+          {keyset}
+        ORDER BY start_date ASC, id ASC
+        LIMIT %s
+    """
+
+
+@cached("smu_schedule")
+def _query_schedule_interval(
+    start_iso: str,
+    end_iso: str,
+    user_id: Optional[str],
+    after: Optional[tuple],
+    page_size: int,
+) -> tuple[list[dict], Optional[tuple]]:
+    """
+    내부 헬퍼: [start_iso, end_iso) 구간과 겹치는 일정 (start_date < end AND end_date >= start).
+    - common / personal 을 UNION ALL 로 나눠 각 가지가 (type, user_id, start_date) 인덱스를 타도록 함
+    - (start_date, id) keyset 페이지네이션
+    - 스냅샷 모드에서는 common 가지를 로컬 스냅샷에서 읽고 personal 가지와 병합
+    """
+    keyset = ""
+    keyset_params: list = []
+    if after is not None:
+        keyset = "AND (start_date > %s OR (start_date = %s AND id > %s))"
+        keyset_params = [after[0], after[0], after[1]]
+
+    common_sql = _schedule_branch_sql("type = 'common'", keyset)
+    personal_sql = _schedule_branch_sql("type = 'personal' AND user_id = %s", keyset)
+    common_params = [end_iso, start_iso, *keyset_params, page_size + 1]
+    personal_params = [user_id, end_iso, start_iso, *keyset_params, page_size + 1]
+    store = get_snapshot()
+    if store is not None and store.has("smu_schedule"):
+        # 스냅샷 모드: common 가지는 로컬 스냅샷, personal 가지만 MySQL에서 읽어 병합
+        with store.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(common_sql, common_params)
+                rows = list(cur.fetchall())
+        if user_id:
+            with _db_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(personal_sql, personal_params)
+                    rows += cur.fetchall()
+        rows.sort(key=lambda r: (str(r["start_date"]), r["id"]))
+        rows = rows[:page_size + 1]
+    else:
+        selects = [f"({common_sql})"]
+        params: list = list(common_params)
+        if user_id:
+            selects.append(f"({personal_sql})")
+            params += personal_params
+        sql = " UNION ALL ".join(selects) + " ORDER BY start_date ASC, id ASC LIMIT %s"
+        params.append(page_size + 1)
+
+        with _db_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                rows = list(cur.fetchall())
+
+    next_key = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_key = (str(rows[-1]["start_date"]), rows[-1]["id"])
+    return rows, next_key
+
+
+# ---- 사용자별 일정 뷰 (메모리 구간 인덱스) ----
+# 일정 날짜 조회는 common 행 + 한 사용자의 personal 행만 보면 되므로,
+# common 행은 한 번만, personal 행은 user_id별로 (start_date, id) 정렬 배열에 들고 메모리에서 구간 겹침을 답한다.
+# 사용자 목록은 처음 조회할 때 읽고 LRU로 내보내며, 이 서버를 거친 추가/삭제는 바로 반영한다.
+# 다른 워커/서버의 쓰기는 SCHEDULE_VIEW_TTL 안에 다시 읽어 반영한다.
+def get_schedule_view_config():
+    """사용자별 일정 뷰 설정을 환경변수에서 읽어오는 함수"""
+    return {
+        "enabled": os.getenv("SCHEDULE_VIEW", "1").lower() not in ("0", "false", "no", "off"),
+        "max_users": int(os.getenv("SCHEDULE_VIEW_USERS", "1000")),
+        "ttl": float(os.getenv("SCHEDULE_VIEW_TTL", "60")),
+    }
+
+
+_SCHEDULE_VIEW_COLUMNS = "id, start_date, end_date, content, type, user_id, created_at"
+
+
+def _schedule_key(row: dict) -> tuple[str, int]:
+    return str(row["start_date"]), row["id"]
+
+
+class _IntervalList:
+    """
+    (start_date, id) 순으로 정렬된 일정 배열 (불변; 바뀌면 새로 만든다).
+    prefix_max_end[i] = rows[0..i]의 끝 시각 최댓값 → 구간 시작보다 먼저 끝나는 앞부분을 이분 탐색으로 건너뛴다.
+    """
+
+    __slots__ = ("rows", "keys", "prefix_max_end")
+
+    def __init__(self, rows):
+        self.rows = sorted((r for r in rows if r.get("start_date") is not None), key=_schedule_key)
+        self.keys = [_schedule_key(r) for r in self.rows]
+        self.prefix_max_end = []
+        running = ""
+        for r in self.rows:
+            running = max(running, str(r["end_date"] or r["start_date"]))
+            self.prefix_max_end.append(running)
+
+    def overlapping(self, start_iso: str, end_iso: str, after: Optional[tuple]):
+        """[start_iso, end_iso)와 겹치는 행을 (start_date, id) 순으로 (after 이후만)"""
+        i = bisect.bisect_left(self.prefix_max_end, start_iso)
+        if after is not None:
+            i = max(i, bisect.bisect_right(self.keys, (str(after[0]), int(after[1]))))
+        for j in range(i, len(self.rows)):
+            start, _ = self.keys[j]
+            if start >= end_iso:
+                return
+            row = self.rows[j]
+            if str(row["end_date"] or row["start_date"]) >= start_iso:
+                yield row
+
+    def upsert(self, rows) -> "_IntervalList":
+        ids = {r["id"] for r in rows}
+        return _IntervalList([r for r in self.rows if r["id"] not in ids] + list(rows))
+
+    def remove(self, ids) -> "_IntervalList":
+        ids = set(ids)
+        return _IntervalList([r for r in self.rows if r["id"] not in ids])
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class ScheduleView:
+    """common 일정 하나 + user_id별 personal 일정 (LRU)"""
+
+    def __init__(self, max_users: int = 1000, ttl: float = 60):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._common: Optional[tuple[float, _IntervalList]] = None  # (loaded_at, list)
+        self._users: OrderedDict = OrderedDict()  # user_id -> (loaded_at, list)
+        self._stats = {"hits": 0, "loads": 0, "evictions": 0}
+
+    @staticmethod
+    def _load(where: str, params: tuple, source=None) -> _IntervalList:
+        with (source or _db_conn)() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT {_SCHEDULE_VIEW_COLUMNS} FROM smu_schedule WHERE {where}", params)
+                return _IntervalList(cur.fetchall())
+
+    def _common_list(self) -> _IntervalList:
+        entry = self._common
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        store = get_snapshot()
+        source = store.connection if store is not None and store.has("smu_schedule") else None
+        loaded, fresh = _SINGLE_FLIGHT.do(
+            ("schedule_view:common",), lambda: self._load("type = 'common'", (), source), "smu_schedule"
+        )
+        if fresh:
+            self._common = (time.monotonic(), loaded)
+        return loaded
+
+    def _user_list(self, user_id: str) -> _IntervalList:
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._users.move_to_end(user_id)
+                self._stats["hits"] += 1
+                return entry[1]
+        loaded, fresh = _SINGLE_FLIGHT.do(
+            ("schedule_view:user", user_id),
+            lambda: self._load("type = 'personal' AND user_id = %s", (user_id,)),
+            "smu_schedule", user_id,
+        )
+        if fresh:
+            with self._lock:
+                self._stats["loads"] += 1
+                self._users[user_id] = (time.monotonic(), loaded)
+                self._users.move_to_end(user_id)
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return loaded
+
+    def personal_rows(self, user_id: str) -> list[dict]:
+        return self._user_list(str(user_id)).rows
+
+    def overlap(
+        self, start_iso: str, end_iso: str, user_id: Optional[str], after: Optional[tuple], page_size: int
+    ) -> tuple[list[dict], Optional[tuple]]:
+        """_query_schedule_interval과 같은 결과를 메모리에서 (common + 해당 사용자 personal, (start_date, id) 순)"""
+        lists = [self._common_list()]
+        if user_id:
+            lists.append(self._user_list(str(user_id)))
+        merged = heapq.merge(*(lst.overlapping(start_iso, end_iso, after) for lst in lists), key=_schedule_key)
+        rows = list(itertools.islice(merged, page_size + 1))
+        next_key = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_key = (str(rows[-1]["start_date"]), rows[-1]["id"])
+        return rows, next_key
+
+    def upsert(self, rows) -> None:
+        """쓰기 직후 반영 (읽어 둔 사용자/공통 목록에만; 아직 안 읽었으면 다음 조회 때 읽음)"""
+        with self._lock:
+            for row in rows:
+                # 쓰기 경로는 SELECT * 로 읽으므로 조회 결과와 같은 컬럼만 남긴다
+                row = {c: row.get(c) for c in _SCHEDULE_VIEW_COLUMNS.split(", ")}
+                if row["type"] == "common":
+                    if self._common is not None:
+                        self._common = (self._common[0], self._common[1].upsert([row]))
+                    continue
+                uid = str(row.get("user_id"))
+                entry = self._users.get(uid)
+                if entry is not None:
+                    self._users[uid] = (entry[0], entry[1].upsert([row]))
+
+    def remove(self, user_id: str, ids) -> None:
+        with self._lock:
+            entry = self._users.get(str(user_id))
+            if entry is not None:
+                self._users[str(user_id)] = (entry[0], entry[1].remove(ids))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "users": len(self._users),
+                "personal_rows": sum(len(lst) for _, lst in self._users.values()),
+                "common_rows": len(self._common[1]) if self._common is not None else 0,
+            }
+
 
-# (기존) 키워드 검색 도구가 필요하면 이 버전처럼 안전하게 수정
-@mcp.tool()
-def query_smu_meals_by_keyword(keyword: str) -> dict:
-    """
-    'meal' 텍스트 등에서 키워드 검색 (보조 용도)
-    """
-    conn = pymysql.connect(
-        host=DB_HOST, user=DB_USER, password=DB_PASSWORD,
-        database=DB_NAME, port=DB_PORT, cursorclass=DictCursor, charset="utf8mb4"
-    )
-    try:
-        with conn.cursor() as cur:
-            sql = "SELECT * FROM smu_meals WHERE meal LIKE %s"
-            cur.execute(sql, (f"%{keyword}%",))
-            return cur.fetchall()
-    finally:
-        conn.close()
+_SCHEDULE_VIEW: Optional[ScheduleView] = None
+_SCHEDULE_VIEW_LOCK = threading.Lock()
 
-@mcp.tool()
-def query_smu_notices_by_keyword(keyword: str) -> dict:
-    """
-    'smu_notices' 테이블에서 'title' 컬럼에 특정 키워드를 포함하는 행을 조회하여 결과를 반환하는 도구.
-    
-    Args:
-        keyword (str): 'title' 컬럼에서 찾을 키워드.
-        
-        dict: 키워드가 포함된 'title' 컬럼을 가진 행들 반환.
-    """
 
-    # MySQL 연결
-    conn = pymysql.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME,
-            port=DB_PORT
-        )
-    cursor = conn.cursor()
+def get_schedule_view() -> Optional[ScheduleView]:
+    """SCHEDULE_VIEW가 켜져 있으면 프로세스 전역 뷰 (첫 사용 시 생성)"""
+    global _SCHEDULE_VIEW
+    config = get_schedule_view_config()
+    if not config["enabled"]:
+        return None
+    if _SCHEDULE_VIEW is None:
+        with _SCHEDULE_VIEW_LOCK:
+            if _SCHEDULE_VIEW is None:
+                _SCHEDULE_VIEW = ScheduleView(config["max_users"], config["ttl"])
+    return _SCHEDULE_VIEW
 
-        # 쿼리 작성: 'title' 컬럼에서 키워드를 포함하는 행을 찾는 쿼리
-    sql = f"SELECT * FROM smu_notices WHERE title LIKE %s"
-    cursor.execute(sql, (f"%{keyword}%",))
-        
-    return cursor.fetchall()
-    
-@mcp.tool()
-def query_smu_exam(keyword: str, professor: str | None = None) -> list[dict]:
-    """
-    smu_exam 테이블에서 subject_name, professor 조건을 조합해 검색.
-    - professor 인자가 주어지면 AND 조건으로 subject_name + professor 검색
-    - professor가 없으면 subject_name만 검색
-    - 반환: list[dict]
-    """
-    conn = pymysql.connect(
-        host=DB_HOST, user=DB_USER, password=DB_PASSWORD,
-        database=DB_NAME, port=DB_PORT,
-        cursorclass=DictCursor, charset="utf8mb4"
-    )
-    try:
-        with conn.cursor() as cur:
-            if professor:
-                sql = """
-                    SELECT *
-                    FROM smu_exam
-                    WHERE subject_name IS NOT NULL
-                      AND subject_name LIKE %s
-                      AND professor IS NOT NULL
-                      AND professor LIKE %s
-                    ORDER BY subject_name ASC
-                """
-                cur.execute(sql, (f"%{keyword}%", f"%{professor}%"))
-            else:
-                sql = """
-                    SELECT *
-                    FROM smu_exam
-                    WHERE subject_name IS NOT NULL
-                      AND subject_name LIKE %s
-                    ORDER BY subject_name ASC
-                """
-                cur.execute(sql, (f"%{keyword}%",))
-            return cur.fetchall()
-    finally:
-        conn.close()
-        
-@mcp.tool()
-def query_smu_schedule_by_keyword(keyword: str, user_id: Optional[str] = None) -> list[dict]:
+
+def _schedule_overlap(
+    start_iso: str, end_iso: str, user_id: Optional[str], after: Optional[tuple], page_size: int
+) -> tuple[list[dict], Optional[tuple]]:
+    """구간 겹침 일정: 사용자별 일정 뷰가 켜져 있으면 메모리에서, 아니면 DB(결과 캐시)에서"""
+    view = get_schedule_view()
+    if view is not None:
+        return view.overlap(start_iso, end_iso, user_id, after, page_size)
+    return _query_schedule_interval(start_iso, end_iso, user_id, after, page_size)
+
+
+@db_tool()
+def query_smu_schedule_by_date(
+    date_keyword: Optional[str] = None,
+    user_id: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+    format: Optional[str] = None,
+) -> dict:
     """
-    'smu_schedule' 테이블에서 'content' 컬럼에 특정 키워드를 포함하는 행을 조회하여 결과를 반환하는 도구.
+    'smu_schedule' 테이블에서 날짜(구간)에 걸쳐 있는 일정을 찾아 반환하는 도구.
+    날짜 표현을 KST 구간으로 해석한 뒤, 그 구간과 겹치는 일정(여러 날짜에 걸친 일정 포함)을 반환합니다.
     type에 따라 필터링: 'common'은 모든 사용자에게, 'personal'은 해당 user_id에게만 제공.
     
     Args:
-        keyword (str): 'content' 컬럼에서 찾을 키워드.
+        date_keyword (str, optional): 검색할 날짜 표현 (예: '2025-10-21', '10-21', '10월 21일', '내일', '다음 주', '이번 달', '다음 주 화요일')
         user_id (str, optional): student ID (학번). 제공되면 해당 사용자의 개인 일정도 포함.
+        date_from (str, optional): 달력 보기용 범위 시작 날짜 (포함). date_keyword 대신 사용.
+        date_to (str, optional): 달력 보기용 범위 끝 날짜 (포함).
+        limit (int, optional): 한 페이지 최대 행 수 (기본 50, 최대 200).
+        cursor (str, optional): 이전 응답의 next_cursor. 주면 그 다음 페이지를 반환.
+        fields (list[str], optional): 반환할 컬럼 목록. 생략하면 전체 컬럼.
+        format (str, optional): 'rows'(기본, 행마다 dict) | 'columnar'(columns 한 번 + rows 값 배열).
         
     Returns:
-        list[dict]: 키워드가 포함된 일정들 (type='common' + user_id가 일치하는 type='personal')
-    """
-    conn = pymysql.connect(
-        host=DB_HOST,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        database=DB_NAME,
-        port=DB_PORT,
-        cursorclass=DictCursor,
-        charset="utf8mb4"
+        dict: { items, count, next_cursor, range: { start, end } } - items는 구간과 겹치는 스케줄들 (start_date 순)
+    """
+    start, end = _resolve_date_interval(date_keyword, date_from, date_to)
+    fmt = "%Y-%m-%d %H:%M:%S"
+    rows, next_key = _schedule_overlap(
+        start.strftime(fmt), end.strftime(fmt), user_id,
+        _decode_cursor(cursor, _INTERVAL_CURSOR), _clamp_limit(limit),
     )
-    try:
-        with conn.cursor() as cur:
-            if user_id:
-                # user_id가 있으면: common + 해당 user_id의 personal 일정
-                sql = """
-                    SELECT * FROM smu_schedule 
-                    WHERE content LIKE %s 
-                    AND (type = 'common' OR (type = 'personal' AND user_id = %s))
-                    ORDER BY start_date ASC
-                """
-                cur.execute(sql, (f"%{keyword}%", user_id))
-            else:
-                # user_id가 없으면: common 일정만
-                sql = """
-                    SELECT * FROM smu_schedule 
-                    WHERE content LIKE %s AND type = 'common'
-                    ORDER BY start_date ASC
-                """
-                cur.execute(sql, (f"%{keyword}%",))
-            
-            return cur.fetchall()
-    finally:
-        conn.close()
+    page = _page(rows, next_key, fields, format)
+    page["range"] = {"start": start.isoformat(), "end": end.isoformat()}
+    return page
+
+# ---- 오늘 묶음 미리 계산 (KST 자정 + 지정 시각) ----
+# 프롬프트 흐름상 매 대화가 now_kr → 오늘 식단 → 오늘 일정을 부르므로,
+# 백그라운드 스케줄러가 KST 날짜 경계와 PREWARM_TIMES 시각마다 오늘/내일 식단과 오늘 공통 일정을 미리 계산해 둔다.
+# 계산은 캐시 헬퍼를 그대로 거치므로 개별 조회 툴의 캐시도 함께 데워진다.
+# 묶음은 식단/일정 캐시 TTL 중 짧은 쪽보다 오래되면 요청 시 다시 만든다 (예약 시각 사이에 바뀐 데이터도 TTL 안에 보이도록).
+def get_prewarm_config():
+    """미리 계산 스케줄러 설정을 환경변수에서 읽어오는 함수"""
+    times = {"00:00"}
+    for t in os.getenv("PREWARM_TIMES", "07:00,11:00,16:30").split(","):
+        if t.strip():
+            times.add(datetime.strptime(t.strip(), "%H:%M").strftime("%H:%M"))
+    return {
+        "enabled": os.getenv("PREWARM_ENABLED", "1").lower() not in ("0", "false", "no", "off"),
+        "times": sorted(times),
+    }
+
+
+_TODAY_BUNDLE: Optional[dict] = None
+_TODAY_BUNDLE_AT = 0.0  # 만든 시각 (monotonic)
+_PREWARM_LOCK = threading.Lock()
+_PREWARM_THREAD: Optional[threading.Thread] = None
+
+
+def _build_today_bundle(now: Optional[datetime] = None) -> dict:
+    """오늘·내일 전체 카테고리 식단 + 오늘 공통 일정 (RESPONSE_FORMAT과 무관하게 rows 형식으로 인코딩해 보관)"""
+    now = now or datetime.now(KST)
+    today = _day_start(now)
+    tomorrow = today + timedelta(days=1)
+    meals = _query_meals_range(today.date().isoformat(), tomorrow.date().isoformat(), MEAL_CATEGORIES)
+    fmt = "%Y-%m-%d %H:%M:%S"
+    rows, next_key = _schedule_overlap(
+        today.strftime(fmt), tomorrow.strftime(fmt), None, None, DEFAULT_PAGE_LIMIT
+    )
+    schedule = _page(rows, next_key, format="rows")
+    schedule["range"] = {"start": today.isoformat(), "end": tomorrow.isoformat()}
+    return {
+        "date": today.date().isoformat(),
+        "generated_at": now.isoformat(),
+        "meals": {
+            day: {cat: encode_rows(cat_rows, format="rows")["items"] for cat, cat_rows in by_cat.items()}
+            for day, by_cat in meals.items()
+        },
+        "schedule": schedule,
+    }
+
+
+def refresh_today_bundle() -> dict:
+    global _TODAY_BUNDLE, _TODAY_BUNDLE_AT
+    bundle = _build_today_bundle()
+    _TODAY_BUNDLE, _TODAY_BUNDLE_AT = bundle, time.monotonic()
+    return bundle
+
+
+def _today_bundle_max_age() -> float:
+    """묶음을 그대로 돌려줄 수 있는 최대 나이(초) = 식단/일정 캐시 TTL 중 짧은 쪽"""
+    ttls = get_cache_config()["ttls"]
+    return min(ttls["smu_meals"], ttls["smu_schedule"])
+
+
+def _next_prewarm_at(now: datetime, times: list[str]) -> datetime:
+    """now 이후 가장 가까운 예약 시각 (KST)"""
+    for day_offset in (0, 1):
+        day = _day_start(now) + timedelta(days=day_offset)
+        for t in times:
+            hh, mm = map(int, t.split(":"))
+            at = day.replace(hour=hh, minute=mm)
+            if at > now:
+                return at
+    return _day_start(now) + timedelta(days=1)
 
-@mcp.tool()
-def query_smu_schedule_by_date(date_keyword: str, user_id: Optional[str] = None) -> list[dict]:
+
+def _prewarm_loop(times: list[str]) -> None:
+    _CURRENT_TOOL.set("background:prewarm")
+    while True:
+        try:
+            refresh_today_bundle()
+        except Exception as e:
+            logger.warning("today bundle prewarm failed: %s", e)
+        now = datetime.now(KST)
+        time.sleep(max(1.0, (_next_prewarm_at(now, times) - now).total_seconds()))
+
+
+def start_prewarm_scheduler() -> None:
+    """미리 계산 스케줄러를 한 번만 시작 (PREWARM_ENABLED=0이면 아무것도 하지 않음)"""
+    global _PREWARM_THREAD
+    config = get_prewarm_config()
+    if not config["enabled"]:
+        return
+    with _PREWARM_LOCK:
+        if _PREWARM_THREAD is None:
+            _PREWARM_THREAD = threading.Thread(
+                target=_prewarm_loop, args=(config["times"],), name="smus-prewarm", daemon=True
+            )
+            _PREWARM_THREAD.start()
+
+
+@db_tool()
+def today_bundle(user_id: Optional[str] = None) -> dict:
     """
-    'smu_schedule' 테이블에서 날짜를 키워드로 찾아 해당하는 content를 반환하는 도구.
-    start_date 또는 end_date 컬럼에서 날짜를 검색하여 일치하는 스케줄의 content를 반환합니다.
-    type에 따라 필터링: 'common'은 모든 사용자에게, 'personal'은 해당 user_id에게만 제공.
-    
+    오늘 필요한 정보를 한 번에 반환하는 도구 (now_kr + 오늘/내일 식단 + 오늘 일정).
+    서버가 KST 자정과 정해진 시각마다 미리 계산해 둔 결과를 돌려주므로 대부분 DB를 거치지 않습니다.
+    미리 계산한 결과가 식단/일정 캐시 TTL보다 오래됐으면 다시 계산합니다.
+
     Args:
-        date_keyword (str): 검색할 날짜 키워드 (예: '2025-10-21', '10-21', '10월 21일' 등)
-        user_id (str, optional): student ID (학번). 제공되면 해당 사용자의 개인 일정도 포함.
-        
+        user_id (str, optional): student ID (학번). 주면 오늘 일정에 해당 사용자의 개인 일정도 포함.
+
     Returns:
-        list[dict]: 날짜와 일치하는 스케줄들 (type='common' + user_id가 일치하는 type='personal')
-    """
-    conn = pymysql.connect(
-        host=DB_HOST,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        database=DB_NAME,
-        port=DB_PORT,
-        cursorclass=DictCursor,
-        charset="utf8mb4"
-    )
-    try:
-        with conn.cursor() as cur:
-            date_pattern = f"%{date_keyword}%"
-            
-            if user_id:
-                # user_id가 있으면: common + 해당 user_id의 personal 일정
-                sql = """
-                    SELECT id, start_date, end_date, content, type, user_id, created_at
-                    FROM smu_schedule 
-                    WHERE (DATE(start_date) LIKE %s 
-                       OR DATE(end_date) LIKE %s
-                       OR start_date LIKE %s 
-                       OR end_date LIKE %s)
-                    AND (type = 'common' OR (type = 'personal' AND user_id = %s))
-                    ORDER BY start_date ASC
-                """
-                cur.execute(sql, (date_pattern, date_pattern, date_pattern, date_pattern, user_id))
-            else:
-                # user_id가 없으면: common 일정만
-                sql = """
-                    SELECT id, start_date, end_date, content, type, user_id, created_at
-                    FROM smu_schedule 
-                    WHERE (DATE(start_date) LIKE %s 
-                       OR DATE(end_date) LIKE %s
-                       OR start_date LIKE %s 
-                       OR end_date LIKE %s)
-                    AND type = 'common'
-                    ORDER BY start_date ASC
-                """
-                cur.execute(sql, (date_pattern, date_pattern, date_pattern, date_pattern))
-            
-            return cur.fetchall()
-    finally:
-        conn.close()
+        dict: {
+            now: now_kr 결과,
+            generated_at: 미리 계산한 시각 (ISO),
+            meals: { 'YYYY-MM-DD'(오늘, 내일): { breakfast/lunch/dinner: [레코드, ...] } },
+            schedule: { items, count, next_cursor, range } - 오늘과 겹치는 일정
+        }
+    """
+    start_prewarm_scheduler()
+    now = now_kr.__wrapped__()
+    bundle = _TODAY_BUNDLE
+    if (bundle is None or bundle["date"] != now["date"]
+            or time.monotonic() - _TODAY_BUNDLE_AT >= _today_bundle_max_age()):
+        bundle = refresh_today_bundle()
+    result = {"now": now, **{k: bundle[k] for k in ("generated_at", "meals", "schedule")}}
+    if user_id:
+        start = _day_start(date.fromisoformat(now["date"]))
+        fmt = "%Y-%m-%d %H:%M:%S"
+        rows, next_key = _schedule_overlap(
+            start.strftime(fmt), (start + timedelta(days=1)).strftime(fmt), user_id, None, DEFAULT_PAGE_LIMIT
+        )
+        result["schedule"] = {**_page(rows, next_key, format="rows"), "range": bundle["schedule"]["range"]}
+    return result
 
-@mcp.tool()
+@local_tool()
 def query_special_keywords(keyword: str) -> dict:
     """
     특정 키워드에 대해 미리 정의된 응답을 반환하는 도구.
@@ -345,7 +2491,23 @@ def query_special_keywords(keyword: str) -> dict:
 
     return responses[keyword]
 
-@mcp.tool()
+@local_tool()
+def snapshot_status() -> dict:
+    """
+    로컬 스냅샷(SNAPSHOT_MODE) 상태를 반환하는 도구.
+    테이블별 행 수, 마지막 동기화 시각(KST), 지연(lag_seconds), 마지막 오류를 보여줍니다.
+    첫 전체 동기화가 끝나기 전이면 synced=false만 보고합니다.
+    """
+    config = get_snapshot_config()
+    if not config["enabled"]:
+        return {"enabled": False}
+    # 이벤트 루프에서 바로 실행되므로 get_snapshot()(첫 전체 동기화/락 대기)을 부르지 않고 현재 상태만 읽는다
+    store = _SNAPSHOT
+    if store is None:
+        return {"enabled": True, "synced": False, "path": config["path"], "tables": {}}
+    return {"enabled": True, "synced": True, "path": store.path, "tables": store.status()}
+
+@db_tool()
 def add_smu_schedule_structured(
     start_datetime: str,
     content: str,
@@ -377,34 +2539,36 @@ def add_smu_schedule_structured(
     final_user_id = user_id
 
     # 3) DB insert
-    conn = pymysql.connect(
-        host=DB_HOST, user=DB_USER, password=DB_PASSWORD,
-        database=DB_NAME, port=DB_PORT, cursorclass=DictCursor, charset="utf8mb4"
-    )
-    try:
-        with conn.cursor() as cur:
-            sql = """
-                INSERT INTO smu_schedule (start_date, end_date, content, type, user_id, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            cur.execute(
-                sql,
-                (
-                    start_dt.strftime("%Y-%m-%d %H:%M:%S"),
-                    end_dt.strftime("%Y-%m-%d %H:%M:%S"),
-                    content,
-                    schedule_type,
-                    final_user_id,
-                    created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                ),
-            )
-            conn.commit()  # autocommit이 없으므로 명시적으로 commit
-            inserted_id = cur.lastrowid
-    except Exception as e:
-        conn.rollback()
-        raise RuntimeError(f"Failed to insert schedule: {e}")
-    finally:
-        conn.close()
+    with _db_conn() as conn:
+        try:
+            conn.begin()
+            with conn.cursor() as cur:
+                sql = """
+                    INSERT INTO smu_schedule (start_date, end_date, content, type, user_id, created_at)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """
+                cur.execute(
+                    sql,
+                    (
+                        start_dt.strftime("%Y-%m-%d %H:%M:%S"),
+                        end_dt.strftime("%Y-%m-%d %H:%M:%S"),
+                        content,
+                        schedule_type,
+                        final_user_id,
+                        created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                    ),
+                )
+                conn.commit()
+                inserted_id = cur.lastrowid
+                # 일정 뷰에 바로 반영할 수 있도록 저장된 행을 PK로 다시 읽는다
+                cur.execute("SELECT * FROM smu_schedule WHERE id = %s", (inserted_id,))
+                inserted_row = cur.fetchone()
+        except Exception as e:
+            conn.rollback()
+            raise RuntimeError(f"Failed to insert schedule: {e}")
+    _invalidate_results("smu_schedule", final_user_id)
+    if inserted_row and _SCHEDULE_VIEW is not None:
+        _SCHEDULE_VIEW.upsert([inserted_row])
 
     return {
         "ok": True,
@@ -418,7 +2582,169 @@ def add_smu_schedule_structured(
     }
 
 
-@mcp.tool()
+class ScheduleEntry(BaseModel):
+    """add_smu_schedules_bulk에 넘기는 일정 한 건 (add_smu_schedule_structured와 같은 형식)"""
+    start_datetime: str
+    content: str
+    end_datetime: Optional[str] = None
+
+
+MAX_BULK_SCHEDULES = 500
+BULK_INSERT_BATCH = 100
+
+
+@db_tool()
+def add_smu_schedules_bulk(
+    entries: list[ScheduleEntry],
+    user_id: str,
+    skip_duplicates: bool = False,
+) -> dict:
+    """
+    여러 개인 일정을 한 번에 `smu_schedule`에 넣는다. (학기 시간표, 학과 행사 목록 가져오기 등)
+    모든 항목을 먼저 검증하고, 하나라도 잘못되면 아무것도 넣지 않는다.
+    하나의 트랜잭션 안에서 여러 행 INSERT를 묶어(배치당 100행) 실행한다.
+
+    Args:
+        entries (list): [{ start_datetime, content, end_datetime? }, ...] (최대 500건, 형식은 add_smu_schedule_structured와 동일)
+        user_id (str): student ID (학번). Required parameter.
+        skip_duplicates (bool): True면 (user_id, start_date, content)가 이미 있는 일정(및 목록 안의 중복)은 건너뜀.
+
+    Returns:
+        dict: { ok, inserted_count, ids, skipped, user_id }
+            skipped: 이미 있는 일정은 { index, existing_id }, 목록 안의 중복은 { index, duplicate_of } (먼저 나온 항목의 index)
+    """
+    if not entries:
+        raise ValueError("entries must contain at least one schedule.")
+    if len(entries) > MAX_BULK_SCHEDULES:
+        raise ValueError(f"Too many entries: {len(entries)} (max {MAX_BULK_SCHEDULES}).")
+
+    # 1) 전체 검증 (오류는 모아서 한 번에 보고)
+    fmt = "%Y-%m-%d %H:%M:%S"
+    created_at = datetime.now(KST).strftime(fmt)
+    parsed, errors = [], []
+    for i, entry in enumerate(entries):
+        if isinstance(entry, dict):
+            entry = ScheduleEntry(**entry)
+        try:
+            start_dt = _coerce_to_kst(entry.start_datetime)
+            end_dt = _coerce_to_kst(entry.end_datetime) if entry.end_datetime else start_dt
+            if end_dt < start_dt:
+                raise ValueError("end_datetime must be equal to or later than start_datetime.")
+            if not entry.content.strip():
+                raise ValueError("content must not be empty.")
+        except ValueError as e:
+            errors.append(f"entries[{i}]: {e}")
+            continue
+        parsed.append((i, start_dt.strftime(fmt), end_dt.strftime(fmt), entry.content))
+    if errors:
+        raise ValueError("Invalid entries (nothing inserted): " + "; ".join(errors))
+
+    # 2) 한 트랜잭션에서 중복 확인 + 배치 INSERT
+    skipped = []
+    inserted_ids: list[int] = []
+    with _db_conn() as conn:
+        try:
+            conn.begin()
+            with conn.cursor() as cur:
+                if skip_duplicates:
+                    starts = sorted({start for _, start, _, _ in parsed})
+                    cur.execute(
+                        f"""
+                        SELECT id, start_date, content
+                        FROM smu_schedule
+                        WHERE type = 'personal' AND user_id = %s
+                          AND start_date IN ({", ".join(["%s"] * len(starts))})
+                        FOR UPDATE
+                        """,
+                        (user_id, *starts),
+                    )
+                    existing = {(str(r["start_date"]), r["content"]): r["id"] for r in cur.fetchall()}
+                    first_index: dict = {}  # 목록 안의 중복도 건너뜀 (먼저 나온 항목만 넣는다)
+                    unique = []
+                    for i, start, end, content in parsed:
+                        key = (start, content)
+                        if key in existing:
+                            skipped.append({"index": i, "existing_id": existing[key]})
+                        elif key in first_index:
+                            skipped.append({"index": i, "duplicate_of": first_index[key]})
+                        else:
+                            first_index[key] = i
+                            unique.append((i, start, end, content))
+                    parsed = unique
+
+                for b in range(0, len(parsed), BULK_INSERT_BATCH):
+                    batch = parsed[b:b + BULK_INSERT_BATCH]
+                    sql = (
+                        "INSERT INTO smu_schedule (start_date, end_date, content, type, user_id, created_at) VALUES "
+                        + ", ".join(["(%s, %s, %s, 'personal', %s, %s)"] * len(batch))
+                    )
+                    params = [v for _, start, end, content in batch for v in (start, end, content, user_id, created_at)]
+                    cur.execute(sql, params)
+                    if cur.rowcount != len(batch):
+                        raise RuntimeError(f"expected {len(batch)} inserted rows, got {cur.rowcount}")
+                    # 여러 행 INSERT는 한 문장에서 연속된 AUTO_INCREMENT 값을 받으며 lastrowid는 첫 행의 id
+                    # (auto_increment_increment가 1일 때만 성립하므로 아래에서 다시 읽어 확인한다)
+                    inserted_ids.extend(range(cur.lastrowid, cur.lastrowid + len(batch)))
+
+                # 커밋 전에 계산한 id로 다시 읽어, 넣은 항목과 하나라도 다르면 롤백한다
+                inserted_rows = []
+                if inserted_ids:
+                    cur.execute(
+                        f"SELECT * FROM smu_schedule WHERE id IN ({', '.join(['%s'] * len(inserted_ids))})",
+                        inserted_ids,
+                    )
+                    inserted_rows = cur.fetchall()
+                    expected = {
+                        row_id: (start, content) for row_id, (_, start, _, content) in zip(inserted_ids, parsed)
+                    }
+                    if len(inserted_rows) != len(inserted_ids) or any(
+                        str(r.get("user_id")) != str(user_id)
+                        or expected.get(r["id"]) != (str(r["start_date"]), r["content"])
+                        for r in inserted_rows
+                    ):
+                        raise RuntimeError(
+                            "inserted ids could not be verified (is auto_increment_increment other than 1?)"
+                        )
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise RuntimeError(f"Failed to insert schedules: {e}")
+    if inserted_ids:
+        _invalidate_results("smu_schedule", user_id)
+        if _SCHEDULE_VIEW is not None:
+            _SCHEDULE_VIEW.upsert(inserted_rows)
+
+    return {
+        "ok": True,
+        "inserted_count": len(inserted_ids),
+        "ids": inserted_ids,
+        "skipped": skipped,
+        "user_id": user_id,
+    }
+
+
+def _delete_personal_schedules(cur, user_id: str, ids) -> list[int]:
+    """잠근 id 집합을 PK로 한 문장에 삭제 (type='personal'이고 user_id가 일치하는 행만)"""
+    ids = list(ids)
+    if not ids:
+        return []
+    cur.execute(
+        f"""
+        DELETE FROM smu_schedule
+        WHERE id IN ({", ".join(["%s"] * len(ids))}) AND user_id = %s AND type = 'personal'
+        """,
+        (*ids, user_id),
+    )
+    return ids
+
+
+def _after_schedule_delete(user_id: str, ids: list[int]) -> None:
+    _invalidate_results("smu_schedule", user_id)
+    if _SCHEDULE_VIEW is not None:
+        _SCHEDULE_VIEW.remove(user_id, ids)
+
+
+@db_tool()
 def delete_smu_schedule_by_content(content_keyword: str, user_id: str) -> dict:
     """
     내용 키워드로 개인 일정을 삭제하는 도구. (type='personal'인 일정만 삭제 가능)
@@ -430,53 +2756,221 @@ def delete_smu_schedule_by_content(content_keyword: str, user_id: str) -> dict:
     Returns:
         dict: { ok, deleted_count, deleted_ids, message }
     """
-    conn = pymysql.connect(
-        host=DB_HOST, user=DB_USER, password=DB_PASSWORD,
-        database=DB_NAME, port=DB_PORT, cursorclass=DictCursor, charset="utf8mb4"
+    keyword = content_keyword.strip().lower()
+    with _db_conn() as conn:
+        try:
+            conn.begin()
+            with conn.cursor() as cur:
+                # 해당 사용자의 개인 일정을 (user_id, type) 인덱스로 잠그고, 내용 키워드는 여기서 거른다
+                # → 보고한 행과 실제로 삭제되는 행이 항상 같다
+                cur.execute(
+                    """
+                    SELECT id, content
+                    FROM smu_schedule
+                    WHERE user_id = %s AND type = 'personal'
+                    FOR UPDATE
+                    """,
+                    (user_id,),
+                )
+                matching_records = [
+                    r for r in cur.fetchall() if keyword in str(r["content"] or "").lower()
+                ]
+
+                if not matching_records:
+                    conn.rollback()
+                    return {
+                        "ok": False,
+                        "deleted_count": 0,
+                        "deleted_ids": [],
+                        "message": f"No personal schedules found with keyword: {content_keyword} for user_id: {user_id}"
+                    }
+
+                deleted_ids = _delete_personal_schedules(cur, user_id, (r["id"] for r in matching_records))
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise RuntimeError(f"Failed to delete schedules: {e}")
+    _after_schedule_delete(user_id, deleted_ids)
+
+    deleted_contents = [record['content'] for record in matching_records]
+    return {
+        "ok": True,
+        "deleted_count": len(deleted_ids),
+        "deleted_ids": deleted_ids,
+        "message": f"Successfully deleted {len(deleted_ids)} personal schedules: {', '.join(deleted_contents[:3])}{'...' if len(deleted_contents) > 3 else ''}"
+    }
+
+
+@db_tool()
+def delete_smu_schedules_by_ids(ids: list[int], user_id: str) -> dict:
+    """
+    일정 id 목록으로 개인 일정을 한 번에 삭제하는 도구. (type='personal'이고 user_id가 일치하는 일정만)
+    조회 툴에서 받은 id를 그대로 넘기면 된다.
+
+    Args:
+        ids (list[int]): 삭제할 일정 id 목록 (최대 500개)
+        user_id (str): student ID (학번). 해당 사용자의 개인 일정만 삭제 가능
+
+    Returns:
+        dict: { ok, deleted_count, deleted_ids, not_found_ids, message }
+    """
+    wanted = list(dict.fromkeys(int(i) for i in ids))
+    if not wanted:
+        raise ValueError("ids must contain at least one schedule id.")
+    if len(wanted) > MAX_BULK_SCHEDULES:
+        raise ValueError(f"Too many ids: {len(wanted)} (max {MAX_BULK_SCHEDULES}).")
+
+    with _db_conn() as conn:
+        try:
+            conn.begin()
+            with conn.cursor() as cur:
+                # PK로 대상 행을 잠가 실제 삭제될 id를 확정한 뒤, 같은 id 집합을 한 문장으로 삭제
+                cur.execute(
+                    f"""
+                    SELECT id
+                    FROM smu_schedule
+                    WHERE id IN ({", ".join(["%s"] * len(wanted))}) AND user_id = %s AND type = 'personal'
+                    FOR UPDATE
+                    """,
+                    (*wanted, user_id),
+                )
+                found = {r["id"] for r in cur.fetchall()}
+                deleted_ids = _delete_personal_schedules(cur, user_id, (i for i in wanted if i in found))
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise RuntimeError(f"Failed to delete schedules: {e}")
+    if deleted_ids:
+        _after_schedule_delete(user_id, deleted_ids)
+
+    not_found = [i for i in wanted if i not in found]
+    return {
+        "ok": bool(deleted_ids),
+        "deleted_count": len(deleted_ids),
+        "deleted_ids": deleted_ids,
+        "not_found_ids": not_found,
+        "message": f"Deleted {len(deleted_ids)} personal schedules"
+                   + (f"; not found or not owned by user_id {user_id}: {not_found}" if not_found else ""),
+    }
+
+
+# ---- 여러 조회를 한 번에 (batch_query) ----
+# 한 턴에 now_kr → 식단 → 일정 → 공지를 따로 부르면 그만큼 HTTP 왕복이 생기므로,
+# 읽기 툴 호출 목록을 받아 DB 스레드 풀에서 동시에 실행하고 결과/오류를 호출별로 돌려준다.
+MAX_BATCH_CALLS = 10
+BATCH_CALL_TIMEOUT = float(os.getenv("BATCH_CALL_TIMEOUT", "5"))
+BATCH_DEADLINE = float(os.getenv("BATCH_DEADLINE", "10"))
+
+# 배치로 부를 수 있는 읽기 툴 (쓰기 툴은 제외)
+_BATCH_TOOLS = {
+    fn.__name__: fn
+    for fn in (
+        now_kr,
+        today_bundle,
+        query_smu_meals_by_date_category,
+        query_smu_meals_by_date_range,
+        query_smu_meals_by_keyword,
+        query_smu_notices_by_keyword,
+        query_smu_exam,
+        query_smu_schedule_by_keyword,
+        query_smu_schedule_by_date,
+        query_special_keywords,
     )
+}
+
+
+class BatchCall(BaseModel):
+    """batch_query에 넘기는 하위 호출 한 건"""
+    tool: str
+    args: dict = {}
+    id: Optional[str] = None
+    timeout: Optional[float] = None
+
+
+async def _run_batch_call(call: BatchCall, timeout: float) -> dict:
+    started = time.perf_counter()
+    fn = _BATCH_TOOLS.get(call.tool)
     try:
-        with conn.cursor() as cur:
-            # 먼저 해당 키워드와 일치하는 개인 일정들을 조회 (type='personal'이고 user_id가 일치하는 것만)
-            select_sql = """
-                SELECT id, content, type, user_id 
-                FROM smu_schedule 
-                WHERE content LIKE %s AND type = 'personal' AND user_id = %s
-            """
-            cur.execute(select_sql, (f"%{content_keyword}%", user_id))
-            matching_records = cur.fetchall()
-            
-            if not matching_records:
-                return {
-                    "ok": False,
-                    "deleted_count": 0,
-                    "deleted_ids": [],
-                    "message": f"No personal schedules found with keyword: {content_keyword} for user_id: {user_id}"
-                }
-            
-            # 개인 일정들만 삭제 (type='personal'이고 user_id가 일치하는 것만)
-            delete_sql = """
-                DELETE FROM smu_schedule 
-                WHERE content LIKE %s AND type = 'personal' AND user_id = %s
-            """
-            cur.execute(delete_sql, (f"%{content_keyword}%", user_id))
-            conn.commit()
-            
-            deleted_ids = [record['id'] for record in matching_records]
-            deleted_contents = [record['content'] for record in matching_records]
-            
-            return {
-                "ok": True,
-                "deleted_count": len(deleted_ids),
-                "deleted_ids": deleted_ids,
-                "message": f"Successfully deleted {len(deleted_ids)} personal schedules: {', '.join(deleted_contents[:3])}{'...' if len(deleted_contents) > 3 else ''}"
-            }
+        if fn is None:
+            raise ValueError(f"Unknown or non-batchable tool: {call.tool} (allowed: {', '.join(_BATCH_TOOLS)})")
+        try:
+            inspect.signature(fn).bind(**call.args)
+        except TypeError as e:
+            raise ValueError(f"Invalid arguments for {call.tool}: {e}") from None
+        if timeout <= 0:
+            raise asyncio.TimeoutError()
+        if inspect.iscoroutinefunction(fn):
+            result = await asyncio.wait_for(fn(**call.args), timeout)
+        else:
+            result = fn(**call.args)
+        return {"tool": call.tool, "ok": True, "result": result,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
     except Exception as e:
-        conn.rollback()
-        raise RuntimeError(f"Failed to delete schedules: {e}")
-    finally:
-        conn.close()
+        if isinstance(e, asyncio.TimeoutError):
+            error = {"type": "Timeout", "message": f"{call.tool} did not finish within {timeout:.2f}s"}
+        else:
+            error = {"type": type(e).__name__, "message": str(e)}
+        return {"tool": call.tool, "ok": False, "error": error,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+
+async def batch_query(
+    calls: list[BatchCall],
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+) -> dict:
+    """
+    여러 조회 툴을 한 번의 요청으로 동시에 실행하는 도구. (예: now_kr + 오늘 식단 + 오늘 일정 + 공지 검색)
+    하위 호출은 서로 기다리지 않으며, 하나가 느리거나 실패해도 나머지 결과는 그대로 반환됩니다.
+
+    Args:
+        calls (list[BatchCall]): 하위 호출 목록 (최대 10개). 각 항목:
+            - tool: 조회 툴 이름 (now_kr, today_bundle, query_smu_* 조회 툴, query_special_keywords)
+            - args: 그 툴의 인자 dict (예: {"date_iso": "2025-10-21", "category": "lunch"})
+            - id (optional): 결과 키. 생략하면 목록 순번("0", "1", ...)
+            - timeout (optional): 이 호출의 제한 시간(초)
+        timeout (float, optional): 하위 호출 기본 제한 시간(초). 기본 5.
+        deadline (float, optional): 배치 전체 제한 시간(초). 기본 10. 남은 시간이 각 호출 제한 시간의 상한이 됩니다.
+
+    Returns:
+        dict: {
+            results: { id: { tool, ok: true, result, elapsed_ms } | { tool, ok: false, error: { type, message }, elapsed_ms } },
+            count, elapsed_ms
+        }
+    """
+    started = time.perf_counter()
+    try:
+        if not calls:
+            raise ValueError("calls must contain at least one sub-call.")
+        if len(calls) > MAX_BATCH_CALLS:
+            raise ValueError(f"Too many sub-calls: {len(calls)} (max {MAX_BATCH_CALLS}).")
+        calls = [c if isinstance(c, BatchCall) else BatchCall(**c) for c in calls]
+        ids = [c.id if c.id is not None else str(i) for i, c in enumerate(calls)]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Sub-call ids must be unique.")
+
+        # 전체 deadline을 넘지 않도록 각 호출의 제한 시간을 자른다 (시간이 다 되면 스레드의 쿼리는 끝까지 돌고 결과만 버림)
+        end_at = started + (deadline if deadline is not None else BATCH_DEADLINE)
+        default_timeout = timeout if timeout is not None else BATCH_CALL_TIMEOUT
+        outcomes = await asyncio.gather(*(
+            _run_batch_call(c, min(c.timeout if c.timeout is not None else default_timeout,
+                                   end_at - time.perf_counter()))
+            for c in calls
+        ))
+        result = {
+            "results": dict(zip(ids, outcomes)),
+            "count": len(outcomes),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    except Exception as e:
+        _record_tool_call("batch_query", started, error=e)
+        raise
+    _record_tool_call("batch_query", started, result)
+    return result
 
 
+mcp.tool()(batch_query)
+
 # ---- 기본 프롬프트(어제/내일 계산 버그 수정) ----
 @mcp.prompt()
 def default_prompt(message: str) -> list[base.Message]:
@@ -494,18 +2988,26 @@ def default_prompt(message: str) -> list[base.Message]:
             "If you don't have any tools to use for what the user asked, please think and judge for yourself and answer.\n"
             "Before answering any question that depends on dates or times, call the `now_kr` tool to confirm the current date/time in Asia/Seoul.\n"
             "Always consider variations of spacing when interpreting keywords. Treat joined words and separated words as equivalent (e.g., 'lunchmenu' and 'lunch menu', '점심메뉴' and '점심 메뉴'). Automatically account for both forms when extracting or matching keywords.\n"
+            "The keyword search tools already ignore spacing and return results ranked by relevance, so one call per keyword is enough; do not retry with respaced variants.\n"
             "When reasoning about any dates or times, you MUST anchor to the following clock:\n"
             f"- Today: {today_str} ({weekday_str}), Current time: {time_str}, Timezone: Asia/Seoul (KST, UTC+9).\n"
             "Interpret relative terms strictly as:\n"
             f"- 'today/오늘' = {today_str}\n"
             f"- 'yesterday/어제' = {yesterday_str}\n"
             f"- 'tomorrow/내일' = {tomorrow_str}\n"
-            "If the user asks for SMU meals for today or a specific date, prefer:\n"
+            "For today's or tomorrow's meals or today's schedule, call `today_bundle` (pass `user_id` if known) once; it already includes the current KST date/time.\n"
+            "If the user asks for SMU meals for another specific date, prefer:\n"
             "1) Call `now_kr` (get date)\n"
             "2) Then call `query_smu_meals_by_date_category(date_iso, category)`\n"
+            "For several days (e.g. this week's menu) or several categories, call `query_smu_meals_by_date_range(start_date, end_date, categories)` once instead of repeating the single-date tool.\n"
+            "When one answer needs several independent lookups (e.g. meals, schedule and notices), call `batch_query` once with all of them instead of calling each tool in turn.\n"
             "When data includes URLs, always include them in the answer.\n"
+            "If a tool fails with 'Server busy', wait a moment and retry it once before telling the user the service is busy.\n"
+            "For schedules on a date or period, call `query_smu_schedule_by_date` with the user's phrase as `date_keyword` (e.g. '10월 21일', '다음 주', '이번 달'), or with `date_from`/`date_to` for a calendar range; multi-day events overlapping the period are included.\n"
+            "Keyword and schedule query tools return a page `{items, count, next_cursor}`. Use `limit` and `fields` to fetch only what you need, and pass `next_cursor` back as `cursor` only if more results are really needed.\n"
             "Convert the user's natural language into structured inputs for the tool:\n"
             "start_datetime and optional end_datetime must be absolute KST datetimes (YYYY-MM-DD or ISO-like), and content must be a concise title/description. If only one datetime is present, set end_datetime = start_datetime.\n"
+            "When adding several schedules at once (a timetable, an event list), call `add_smu_schedules_bulk` once with all entries instead of calling `add_smu_schedule_structured` repeatedly.\n"
             "\n"
             "IMPORTANT: User-specific data handling:\n"
             "- When using MCP tools that query tables containing user_id (학번), extract the user's student ID (학번) from their message or context if available.\n"
@@ -521,12 +3023,278 @@ def default_prompt(message: str) -> list[base.Message]:
         ),
         base.UserMessage(message),
     ]
-if __name__ == "__main__":
-    # Smithery Python custom container 가이드에 따라 PORT 사용, streamable-http로 실행
-    # 참고: https://smithery.ai/docs/migrations/python-custom-container
+# ---- 스키마 부트스트랩 (opt-in) ----
+# 툴 SQL이 기대하는 인덱스/정규화 컬럼을 information_schema로 확인하고(SCHEMA_BOOTSTRAP=check),
+# 없으면 만든다(SCHEMA_BOOTSTRAP=apply). 끝나면 툴 쿼리마다 EXPLAIN을 돌려 여전히 풀 스캔인 쿼리를 보고한다.
+# 여러 워커가 동시에 DDL을 날리지 않도록 MySQL GET_LOCK으로 한 워커만 실행한다.
+SCHEMA_BOOTSTRAP_MODES = ("off", "check", "apply")
+
+# 정규화 생성 컬럼: (테이블, 컬럼, 정의, 필요 조건 — 원본 컬럼의 DATA_TYPE을 받아 True면 생성)
+_SCHEMA_GENERATED_COLUMNS = [
+    (
+        "smu_meals", "meal_date",
+        "DATE GENERATED ALWAYS AS "
+        "(CAST(REPLACE(REPLACE(LEFT(`date`, 10), '.', '-'), '/', '-') AS DATE)) VIRTUAL",
+        ("date", lambda data_type: data_type not in ("date", "datetime", "timestamp")),
+    ),
+    (
+        "smu_meals", "category_norm",
+        "VARCHAR(32) GENERATED ALWAYS AS (LOWER(TRIM(category))) VIRTUAL",
+        ("category", lambda data_type: True),
+    ),
+]
+
+# 필요한 인덱스: (테이블, 인덱스 이름, 컬럼 — 정규화 컬럼이 있으면 그쪽을 씀)
+def _schema_indexes(columns: dict) -> list[tuple[str, str, list[str]]]:
+    meal_category = "category_norm" if columns.get("smu_meals.category_norm") else "category"
+    meal_date = "meal_date" if columns.get("smu_meals.meal_date") else "date"
+    return [
+        ("smu_meals", f"ix_smu_meals_{meal_category}_{meal_date}", [meal_category, meal_date]),
+        ("smu_schedule", "ix_smu_schedule_type_user_start", ["type", "user_id", "start_date"]),
+        ("smu_exam", "ix_smu_exam_subject_name", ["subject_name"]),
+    ]
+
+
+_SCHEMA_STATE: dict = {"mode": "off", "columns": {}, "created": [], "full_scans": {}, "checked_at": None}
+
+
+def get_schema_bootstrap_mode() -> str:
+    mode = os.getenv("SCHEMA_BOOTSTRAP", "off").strip().lower()
+    if mode not in SCHEMA_BOOTSTRAP_MODES:
+        raise ValueError(f"SCHEMA_BOOTSTRAP must be one of {', '.join(SCHEMA_BOOTSTRAP_MODES)}: {mode!r}")
+    return mode
+
+
+def _table_columns(cur, table: str) -> dict[str, str]:
+    cur.execute(
+        "SELECT COLUMN_NAME, DATA_TYPE FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,),
+    )
+    return {r["COLUMN_NAME"].lower(): r["DATA_TYPE"].lower() for r in cur.fetchall()}
+
+
+def _table_index_prefixes(cur, table: str) -> list[list[str]]:
+    cur.execute(
+        "SELECT INDEX_NAME, SEQ_IN_INDEX, COLUMN_NAME FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY INDEX_NAME, SEQ_IN_INDEX",
+        (table,),
+    )
+    indexes: dict[str, list[str]] = {}
+    for r in cur.fetchall():
+        indexes.setdefault(r["INDEX_NAME"], []).append((r["COLUMN_NAME"] or "").lower())
+    return list(indexes.values())
+
+
+def _explain_probes() -> list[tuple[str, str, tuple]]:
+    """툴이 실제로 보내는 쿼리들 (대표 파라미터로 EXPLAIN)"""
+    today = datetime.now(KST).date()
+    start = _day_start(today).strftime("%Y-%m-%d %H:%M:%S")
+    end = (_day_start(today) + timedelta(days=7)).strftime("%Y-%m-%d %H:%M:%S")
+    meals_sql, meals_params = _meals_range_sql(today, today + timedelta(days=6), list(MEAL_CATEGORIES))
+    probes = [
+        ("query_smu_meals_by_date_range", meals_sql, meals_params),
+        ("query_smu_schedule_by_date[common]", _schedule_branch_sql("type = 'common'"),
+         (end, start, DEFAULT_PAGE_LIMIT + 1)),
+        ("query_smu_schedule_by_date[personal]", _schedule_branch_sql("type = 'personal' AND user_id = %s"),
+         ("0", end, start, DEFAULT_PAGE_LIMIT + 1)),
+        ("delete_smu_schedule_by_content",
+         "SELECT id, content FROM smu_schedule WHERE user_id = %s AND type = 'personal'", ("0",)),
+    ]
+    for table in _SEARCH_INDEXES:
+        probes.append((f"search_index_refresh[{table}]",
+                       f"SELECT * FROM {table} WHERE id > %s ORDER BY id ASC", (0,)))
+    return probes
+
+
+def bootstrap_schema(mode: Optional[str] = None) -> dict:
+    """
+    스키마 확인/보강 후 EXPLAIN 결과를 _SCHEMA_STATE에 기록하고 반환한다.
+    - check: 현재 상태만 확인 (정규화 컬럼이 이미 있으면 툴 SQL이 그 컬럼을 쓰도록 켬)
+    - apply: 없는 정규화 컬럼과 인덱스를 만든 뒤 확인
+    """
+    mode = mode or get_schema_bootstrap_mode()
+    if mode == "off":
+        return _SCHEMA_STATE
+    created: list[str] = []
+    with _db_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT GET_LOCK('smus_schema_bootstrap', 60) AS locked")
+            if not cur.fetchone()["locked"]:
+                raise RuntimeError("Could not take the schema bootstrap lock within 60s")
+            try:
+                tables = {t: _table_columns(cur, t) for t in ("smu_meals", "smu_schedule", "smu_exam")}
+                for table, column, definition, (source, needed) in _SCHEMA_GENERATED_COLUMNS:
+                    cols = tables[table]
+                    if column in cols or source not in cols or not needed(cols[source]):
+                        continue
+                    if mode == "apply":
+                        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                        cols[column] = definition.split()[0].lower()
+                        created.append(f"{table}.{column}")
+                    else:
+                        logger.warning("schema: missing normalized column %s.%s", table, column)
+                columns = {f"{t}.{c}": True for t, cols in tables.items() for c in cols}
+                indexes = _schema_indexes(columns)
+                present = set()
+                for table, name, wanted in indexes:
+                    prefixes = _table_index_prefixes(cur, table)
+                    if any(p[:len(wanted)] == wanted for p in prefixes):
+                        present.add(name)
+                        continue
+                    if mode != "apply":
+                        logger.warning("schema: missing index on %s (%s)", table, ", ".join(wanted))
+                        continue
+                    try:
+                        cur.execute(f"CREATE INDEX {name} ON {table} ({', '.join(f'`{c}`' for c in wanted)})")
+                    except pymysql.err.MySQLError as e:
+                        # 예: `date`에 날짜가 아닌 텍스트가 있으면 meal_date 인덱싱이 실패한다.
+                        # 방금 만든 생성 컬럼은 지워서 다음 시작 때 인덱스 없는 컬럼을 쓰지 않게 한다
+                        logger.error("schema: could not create index %s on %s: %s", name, table, e)
+                        for key in [f"{table}.{c}" for c in wanted if f"{table}.{c}" in created]:
+                            cur.execute(f"ALTER TABLE {table} DROP COLUMN {key.split('.', 1)[1]}")
+                            created.remove(key)
+                            columns.pop(key, None)
+                            logger.error("schema: dropped %s; meal queries keep using the original columns", key)
+                        continue
+                    present.add(name)
+                    created.append(f"{table}.{name}")
+            finally:
+                cur.execute("SELECT RELEASE_LOCK('smus_schema_bootstrap')")
+                cur.fetchall()
+
+            # 정규화 컬럼은 그 컬럼을 쓰는 식단 인덱스가 있을 때만 켠다 (인덱스 없는 VIRTUAL 컬럼은 full scan이고
+            # 날짜로 못 읽는 행은 NULL이 되어 결과에서 빠지므로)
+            meals_indexed = any(t == "smu_meals" and name in present for t, name, _ in indexes)
+            _SCHEMA_STATE["columns"] = {
+                k: True for k in ("smu_meals.meal_date", "smu_meals.category_norm") if columns.get(k) and meals_indexed
+            }
+            full_scans = {}
+            for label, sql, params in _explain_probes():
+                cur.execute("EXPLAIN " + sql, params)
+                scanned = sorted({r["table"] for r in cur.fetchall() if (r.get("type") or "").upper() == "ALL"})
+                full_scans[label] = scanned
+                if scanned:
+                    logger.warning("schema: %s still scans the full table (%s)", label, ", ".join(scanned))
+
+    _SCHEMA_STATE.update(mode=mode, created=created, full_scans=full_scans,
+                         checked_at=datetime.now(KST).isoformat())
+    for item in created:
+        logger.warning("schema: created %s", item)
+    return _SCHEMA_STATE
+
+
+# ---- HTTP 서버 (워커 / 수명주기) ----
+# HTTP_WORKERS > 1이면 uvicorn 워커 프로세스 N개로 띄운다. 세션이 워커 메모리에 묶이지 않도록
+# stateless streamable-HTTP로 동작하며, 풀/캐시/검색 인덱스/스냅샷 리더는 워커마다 따로 가진다.
+def get_http_config():
+    """HTTP 서버 설정을 환경변수에서 읽어오는 함수"""
+    workers = get_worker_count()
+    return {
+        "host": os.getenv("HOST", "0.0.0.0"),
+        "port": int(os.getenv("PORT", "8081")),
+        "workers": workers,
+        # 멀티 워커에서는 어느 워커가 받아도 되도록 항상 stateless
+        "stateless": workers > 1 or os.getenv("HTTP_STATELESS", "0").lower() in ("1", "true", "yes", "on"),
+        # fast: 워밍업을 백그라운드로 / blocking: 워밍업이 끝난 뒤에 리스너를 연다
+        "startup": "blocking" if os.getenv("STARTUP_MODE", "fast").strip().lower() == "blocking" else "fast",
+    }
+
+
+# 워밍업 진행 상태 (/ready가 보고)
+_READINESS: dict = {"ready": False, "done": False, "started_at": None, "ready_at": None, "steps": {}}
+
+
+def _warmup_query() -> None:
+    """풀 커넥션으로 왕복 한 번 (TLS/인증/세션 초기화를 첫 툴 호출 전에 끝냄)"""
+    with _db_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+            cur.fetchall()
+
+
+READY_RETRY_MAX_SECONDS = float(os.getenv("READY_RETRY_MAX_SECONDS", "30"))
+
+
+def _retry_until_ready() -> None:
+    """부팅 때 DB에 닿지 못했으면 워밍업 쿼리를 백오프(1초부터 두 배, 최대 READY_RETRY_MAX_SECONDS)로 재시도해 ready로 바꾼다"""
+    _CURRENT_TOOL.set("background:ready_retry")
+    delay = 1.0
+    while not _READINESS["ready"]:
+        time.sleep(delay)
+        try:
+            _warmup_query()
+        except Exception as e:
+            _READINESS["steps"]["warmup_query"].update(error=f"{type(e).__name__}: {e}")
+            delay = min(delay * 2, READY_RETRY_MAX_SECONDS)
+            continue
+        _READINESS["steps"]["warmup_query"] = {"ok": True, "retried": True}
+        _READINESS["ready"] = True
+        _READINESS["ready_at"] = datetime.now(KST).isoformat()
+        logger.info("worker %d: DB reachable again, marked ready", os.getpid())
+
+
+def _on_worker_startup() -> None:
+    """
+    워커 시작 워밍업: 풀 예열 → 워밍업 쿼리 → 스키마 부트스트랩 → 스냅샷 동기화 → 미리 계산 스케줄러.
+    단계별 결과를 _READINESS에 기록한다. 실패해도 워커는 계속 뜬다.
+    DB 워밍업 쿼리가 성공했거나 스냅샷으로 읽기를 받을 수 있으면 ready.
+    아니면 백그라운드에서 워밍업 쿼리를 재시도하다가 성공하면 ready로 바꾼다.
+    """
+    _CURRENT_TOOL.set("background:warmup")
+    _READINESS["started_at"] = datetime.now(KST).isoformat()
+    steps = _READINESS["steps"]
+
+    def step(name, fn):
+        t0 = time.perf_counter()
+        try:
+            fn()
+            steps[name] = {"ok": True}
+        except Exception as e:
+            logger.warning("worker %d: %s failed: %s", os.getpid(), name, e)
+            steps[name] = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        steps[name]["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+    step("pool", lambda: get_pool().fill())
+    step("warmup_query", _warmup_query)
+    step("schema", bootstrap_schema)
+    step("snapshot", get_snapshot)
+    step("prewarm", start_prewarm_scheduler)
+
+    store = _SNAPSHOT
+    _READINESS["ready"] = steps["warmup_query"]["ok"] or (
+        store is not None and all(store.has(t) for t in SNAPSHOT_TABLES)
+    )
+    _READINESS["done"] = True
+    if _READINESS["ready"]:
+        _READINESS["ready_at"] = datetime.now(KST).isoformat()
+    else:
+        threading.Thread(target=_retry_until_ready, name="smus-ready-retry", daemon=True).start()
+
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready_endpoint(request: Request) -> Response:
+    """준비 상태: 워밍업이 끝나고 DB(또는 스냅샷)로 응답할 수 있으면 200, 아니면 503"""
+    body = {**_READINESS, "import_seconds": round(IMPORT_SECONDS, 3)}
+    return JSONResponse(body, status_code=200 if _READINESS["ready"] else 503)
+
+
+def _on_worker_shutdown() -> None:
+    """워커 종료: 풀 커넥션을 닫고 DB 스레드 풀을 정리"""
+    if _POOL is not None:
+        _POOL.close()
+    _DB_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    _RESULT_CACHE.clear()
+
+
+def create_app():
+    """
+    streamable-HTTP ASGI 앱을 만든다. 멀티 워커 모드에서는 uvicorn이 워커마다 호출한다 (factory).
+    앱 lifespan에 워커 시작/종료 훅을 붙인다. STARTUP_MODE=fast(기본)면 워밍업을 기다리지 않고 바로 요청을 받는다.
+    """
     from starlette.middleware.cors import CORSMiddleware
-    import uvicorn
-    
+
+    mcp.settings.stateless_http = get_http_config()["stateless"]
     app = mcp.streamable_http_app()
     app.add_middleware(
         CORSMiddleware,
@@ -537,6 +3305,44 @@ if __name__ == "__main__":
         expose_headers=["mcp-session-id", "mcp-protocol-version"],
         max_age=86400,
     )
-    import os
-    port = int(os.environ.get("PORT", 8081))
-    uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
+
+    session_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app):
+        warmup = asyncio.ensure_future(_run_blocking(_on_worker_startup))
+        if get_http_config()["startup"] == "blocking":
+            await warmup
+        # fast: 워밍업은 백그라운드에서 돌고, 리스너는 바로 연결을 받는다 (/ready로 완료 확인)
+        try:
+            async with session_lifespan(app) as state:
+                yield state
+        finally:
+            _on_worker_shutdown()
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
+# 모듈 import 시간 (의존성 포함). 콜드 스타트 예산을 넘으면 경고
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+if IMPORT_SECONDS * 1000 > IMPORT_TIME_BUDGET_MS:
+    logger.warning("import took %.0f ms (budget %.0f ms)", IMPORT_SECONDS * 1000, IMPORT_TIME_BUDGET_MS)
+
+
+if __name__ == "__main__":
+    # Smithery Python custom container 가이드에 따라 PORT 사용, streamable-http로 실행
+    # 참고: https://smithery.ai/docs/migrations/python-custom-container
+    import uvicorn
+
+    config = get_http_config()
+    if config["workers"] > 1:
+        # 워커 프로세스가 각자 이 모듈을 import해 create_app()을 호출한다
+        module = os.path.splitext(os.path.basename(__file__))[0]
+        uvicorn.run(
+            f"{module}:create_app", factory=True, host=config["host"], port=config["port"],
+            workers=config["workers"], log_level="info",
+        )
+    else:
+        uvicorn.run(create_app(), host=config["host"], port=config["port"], log_level="info")
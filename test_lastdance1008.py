@@ -0,0 +1,141 @@
+"""
+날짜 표현 파싱, 일정 구간 겹침 조회, 응답 형식, 오늘 묶음 테스트 (DB 없이 실행; 조회 경로는 conftest.py의 가짜 DB 사용).
+
+    python -m pytest -q test_lastdance1008.py
+"""
+from datetime import datetime
+
+import pytest
+
+import lastdance1008
+from conftest import insert_schedules
+from lastdance1008 import KST, _parse_date_phrase, _query_schedule_interval
+
+# 2026-10-14 (수) 10:30 KST 기준
+NOW = datetime(2026, 10, 14, 10, 30, tzinfo=KST)
+
+
+def _day(y, m, d):
+    return datetime(y, m, d, tzinfo=KST)
+
+
+@pytest.mark.parametrize(
+    "phrase, start, end",
+    [
+        ("2025-10-21", _day(2025, 10, 21), _day(2025, 10, 22)),
+        ("2025.10.21", _day(2025, 10, 21), _day(2025, 10, 22)),
+        ("10-21", _day(2026, 10, 21), _day(2026, 10, 22)),
+        ("10/21", _day(2026, 10, 21), _day(2026, 10, 22)),
+        ("10월 21일", _day(2026, 10, 21), _day(2026, 10, 22)),
+        ("2025년 12월", _day(2025, 12, 1), _day(2026, 1, 1)),
+        ("11월", _day(2026, 11, 1), _day(2026, 12, 1)),
+        ("2025-10", _day(2025, 10, 1), _day(2025, 11, 1)),
+        ("오늘", _day(2026, 10, 14), _day(2026, 10, 15)),
+        ("내일", _day(2026, 10, 15), _day(2026, 10, 16)),
+        ("어제", _day(2026, 10, 13), _day(2026, 10, 14)),
+        ("이번 주", _day(2026, 10, 12), _day(2026, 10, 19)),
+        ("다음 주", _day(2026, 10, 19), _day(2026, 10, 26)),
+        ("지난 주", _day(2026, 10, 5), _day(2026, 10, 12)),
+        ("이번 달", _day(2026, 10, 1), _day(2026, 11, 1)),
+        ("다음 달", _day(2026, 11, 1), _day(2026, 12, 1)),
+        ("화요일", _day(2026, 10, 13), _day(2026, 10, 14)),
+        ("다음 주 화요일", _day(2026, 10, 20), _day(2026, 10, 21)),
+        ("3일 후", _day(2026, 10, 17), _day(2026, 10, 18)),
+        ("2일 전", _day(2026, 10, 12), _day(2026, 10, 13)),
+        ("2025-10-21T13:30", _day(2025, 10, 21), _day(2025, 10, 22)),
+    ],
+)
+def test_parse_date_phrase(phrase, start, end):
+    assert _parse_date_phrase(phrase, now=NOW) == (start, end)
+
+
+@pytest.mark.parametrize("phrase", ["", "   ", "다음 주 아무거나", "언젠가"])
+def test_parse_date_phrase_rejects(phrase):
+    with pytest.raises(ValueError):
+        _parse_date_phrase(phrase, now=NOW)
+
+
+# 구간 [2026-10-14, 2026-10-15) 기준 경계 케이스
+SCHEDULES = [
+    (1, "2026-10-01 09:00:00", "2026-10-31 18:00:00", "common", None),      # 앞에서 시작해 길게 이어짐
+    (2, "2026-10-13 09:00:00", "2026-10-14 00:00:00", "common", None),      # 구간 시작 시각에 정확히 끝남 → 포함
+    (3, "2026-10-13 09:00:00", "2026-10-13 23:59:59", "personal", "u1"),    # 구간 시작 전에 끝남 → 제외
+    (4, "2026-10-14 00:00:00", None, "personal", "u1"),                      # end_date 없음 → 시작 시각 기준
+    (5, "2026-10-14 12:00:00", "2026-10-14 13:00:00", "personal", "u2"),    # 다른 사용자의 개인 일정
+    (6, "2026-10-15 00:00:00", "2026-10-15 01:00:00", "common", None),      # 구간 끝 시각에 시작 → 제외 (반열린 구간)
+]
+
+
+@pytest.mark.parametrize(
+    "user_id, expected",
+    [(None, [1, 2]), ("u1", [1, 2, 4]), ("u2", [1, 2, 5])],
+)
+def test_query_schedule_interval_boundaries(fake_db, user_id, expected):
+    insert_schedules(fake_db, SCHEDULES)
+    rows, next_key = _query_schedule_interval.__wrapped__(
+        "2026-10-14 00:00:00", "2026-10-15 00:00:00", user_id, None, 50
+    )
+    assert [r["id"] for r in rows] == expected
+    assert next_key is None
+
+
+def test_query_schedule_interval_keyset_pages(fake_db):
+    insert_schedules(fake_db, SCHEDULES)
+    start, end = "2026-10-14 00:00:00", "2026-10-15 00:00:00"
+    rows, next_key = _query_schedule_interval.__wrapped__(start, end, "u1", None, 2)
+    assert [r["id"] for r in rows] == [1, 2]
+    assert next_key == ("2026-10-13 09:00:00", 2)
+    rows, next_key = _query_schedule_interval.__wrapped__(start, end, "u1", next_key, 2)
+    assert [r["id"] for r in rows] == [4]
+    assert next_key is None
+
+
+def _insert_meals(raw, day: str) -> None:
+    raw.executemany(
+        "INSERT INTO smu_meals (`date`, category, meal) VALUES (?, ?, ?)",
+        [(day, cat, f"{cat} 메뉴") for cat in ("breakfast", "lunch", "dinner")],
+    )
+
+
+@pytest.mark.parametrize("default_format", ["rows", "columnar"])
+def test_meal_tools_honour_explicit_format(fake_db, monkeypatch, default_format):
+    monkeypatch.setattr(lastdance1008, "DEFAULT_RESPONSE_FORMAT", default_format)
+    _insert_meals(fake_db, "2026-10-14")
+
+    by_range = lastdance1008.query_smu_meals_by_date_range.__wrapped__("2026-10-14", None, None, "rows")
+    assert [m["meal"] for m in by_range["2026-10-14"]["lunch"]] == ["lunch 메뉴"]
+    by_day = lastdance1008.query_smu_meals_by_date_category.__wrapped__("2026-10-14", "lunch", "rows")
+    assert [m["meal"] for m in by_day] == ["lunch 메뉴"]
+
+
+def test_meal_tools_share_columnar_shape(fake_db):
+    _insert_meals(fake_db, "2026-10-14")
+    by_range = lastdance1008.query_smu_meals_by_date_range.__wrapped__("2026-10-14", None, ["lunch"], "columnar")
+    by_day = lastdance1008.query_smu_meals_by_date_category.__wrapped__("2026-10-14", "lunch", "columnar")
+    assert set(by_day) == set(by_range) == {"columns", "rows", "count"}
+    assert by_day["count"] == by_range["count"] == 1
+
+
+def test_today_bundle_ignores_columnar_default(fake_db, monkeypatch):
+    monkeypatch.setattr(lastdance1008, "DEFAULT_RESPONSE_FORMAT", "columnar")
+    today = datetime.now(KST).date().isoformat()
+    _insert_meals(fake_db, today)
+
+    bundle = lastdance1008.refresh_today_bundle()  # 미리 계산 스레드가 부르는 경로
+    assert [m["meal"] for m in bundle["meals"][today]["lunch"]] == ["lunch 메뉴"]
+    result = lastdance1008.today_bundle.__wrapped__("u1")
+    assert result["meals"][today]["lunch"][0]["meal"] == "lunch 메뉴"
+    assert result["schedule"]["items"] == []
+
+
+def test_today_bundle_rebuilds_after_ttl(fake_db, monkeypatch):
+    today = datetime.now(KST).date().isoformat()
+    lastdance1008.refresh_today_bundle()
+    _insert_meals(fake_db, today)
+    lastdance1008._RESULT_CACHE.clear()  # 식단 캐시 만료
+
+    # 묶음이 아직 TTL 안이면 미리 계산한 결과 그대로
+    assert lastdance1008.today_bundle.__wrapped__()["meals"][today]["lunch"] == []
+    # TTL보다 오래되면 다시 계산
+    monkeypatch.setattr(lastdance1008, "_TODAY_BUNDLE_AT", 0.0)
+    assert lastdance1008.today_bundle.__wrapped__()["meals"][today]["lunch"][0]["meal"] == "lunch 메뉴"
@@ -0,0 +1,79 @@
+"""
+사용자별 일정 뷰 (메모리 구간 인덱스) 테스트.
+
+    python -m pytest -q test_schedule_view.py
+"""
+from datetime import datetime
+
+import pytest
+
+from conftest import insert_schedules
+from lastdance1008 import ScheduleView, _IntervalList, _query_schedule_interval
+
+
+def _row(row_id, start, end=None):
+    return {"id": row_id, "start_date": datetime.fromisoformat(start),
+            "end_date": datetime.fromisoformat(end) if end else None}
+
+
+INTERVALS = _IntervalList([
+    _row(1, "2026-10-01 09:00:00", "2026-10-31 18:00:00"),  # 앞에서 시작해 길게 이어지는 일정
+    _row(2, "2026-10-13 09:00:00", "2026-10-14 00:00:00"),  # 구간 시작 시각에 정확히 끝남 → 포함
+    _row(3, "2026-10-13 09:00:00", "2026-10-13 23:59:59"),  # 구간 시작 전에 끝남 → 제외
+    _row(4, "2026-10-14 00:00:00"),                         # end_date 없음 → 시작 시각 하루짜리
+    _row(5, "2026-10-14 23:59:59", "2026-10-16 00:00:00"),
+    _row(6, "2026-10-15 00:00:00", "2026-10-15 01:00:00"),  # 구간 끝 시각에 시작 → 제외 (반열린 구간)
+    {"id": 7, "start_date": None, "end_date": None},        # start_date 없는 행은 색인하지 않음
+])
+
+
+@pytest.mark.parametrize(
+    "start, end, after, expected",
+    [
+        ("2026-10-14 00:00:00", "2026-10-15 00:00:00", None, [1, 2, 4, 5]),
+        ("2026-10-14 00:00:00", "2026-10-15 00:00:00", ("2026-10-13 09:00:00", 2), [4, 5]),
+        ("2026-10-15 00:00:00", "2026-10-15 00:00:01", None, [1, 5, 6]),
+        ("2026-11-01 00:00:00", "2026-11-02 00:00:00", None, []),
+    ],
+)
+def test_interval_overlap_boundaries(start, end, after, expected):
+    assert [r["id"] for r in INTERVALS.overlapping(start, end, after)] == expected
+
+
+SCHEDULES = [
+    (1, "2026-10-01 09:00:00", "2026-10-31 18:00:00", "common", None),
+    (2, "2026-10-13 09:00:00", "2026-10-14 00:00:00", "common", None),
+    (3, "2026-10-13 09:00:00", "2026-10-13 23:59:59", "personal", "u1"),
+    (4, "2026-10-14 00:00:00", None, "personal", "u1"),
+    (5, "2026-10-14 12:00:00", "2026-10-14 13:00:00", "personal", "u2"),
+    (6, "2026-10-15 00:00:00", "2026-10-15 01:00:00", "common", None),
+    (7, "2026-10-14 12:00:00", "2026-10-14 12:30:00", "personal", "u1"),
+]
+
+
+@pytest.mark.parametrize("user_id", [None, "u1", "u2"])
+@pytest.mark.parametrize("page_size", [1, 2, 50])
+def test_view_matches_sql(fake_db, user_id, page_size):
+    insert_schedules(fake_db, SCHEDULES)
+    view = ScheduleView()
+    start, end = "2026-10-14 00:00:00", "2026-10-15 00:00:00"
+    after = None
+    while True:
+        sql_rows, sql_next = _query_schedule_interval.__wrapped__(start, end, user_id, after, page_size)
+        view_rows, view_next = view.overlap(start, end, user_id, after, page_size)
+        assert [r["id"] for r in view_rows] == [r["id"] for r in sql_rows]
+        assert view_next == sql_next
+        if sql_next is None:
+            break
+        after = sql_next
+
+
+def test_view_applies_local_writes(fake_db):
+    insert_schedules(fake_db, SCHEDULES)
+    view = ScheduleView()
+    start, end = "2026-10-14 00:00:00", "2026-10-15 00:00:00"
+    assert [r["id"] for r in view.overlap(start, end, "u1", None, 50)[0]] == [1, 2, 4, 7]
+    view.upsert([{"id": 8, "start_date": "2026-10-14 09:00:00", "end_date": None, "content": "새 일정",
+                  "type": "personal", "user_id": "u1", "created_at": None}])
+    view.remove("u1", [4])
+    assert [r["id"] for r in view.overlap(start, end, "u1", None, 50)[0]] == [1, 2, 8, 7]